@@ -6,7 +6,14 @@ Creates synthetic goat images for testing the measurement system
 
 import cv2
 import numpy as np
+import hashlib
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Rendered samples from earlier runs, keyed by the drawing function, its parameters and this script
+CACHE_DIR = "media/goat_images/.cache"
 
 
 def create_sample_goat_image(filename="sample_goat.jpg", width=800, height=600):
@@ -15,15 +22,19 @@ def create_sample_goat_image(filename="sample_goat.jpg", width=800, height=600):
     This creates a basic side-profile silhouette that should be detectable
     """
     # Create a blank image with grass-like background
-    image = np.ones((height, width, 3), dtype=np.uint8) * 180  # Light gray background
+    image = np.full((height, width, 3), 180, dtype=np.uint8)  # Light gray background
     
     # Add some grass texture at bottom
     grass_height = height // 4
     image[height-grass_height:, :] = [34, 139, 34]  # Forest green
     
-    # Add some texture to grass
-    for i in range(0, width, 20):
-        cv2.line(image, (i, height-grass_height), (i+10, height-grass_height-20), (0, 100, 0), 2)
+    # Add some texture to grass, every blade drawn in one polylines call
+    blade_x = np.arange(0, width, 20)
+    blades = np.stack([
+        blade_x, np.full_like(blade_x, height-grass_height),
+        blade_x + 10, np.full_like(blade_x, height-grass_height-20),
+    ], axis=-1).reshape(-1, 2, 2).astype(np.int32)
+    cv2.polylines(image, list(blades), False, (0, 100, 0), 2)
     
     # Define goat body proportions (side view)
     goat_width = width // 2
@@ -77,16 +88,19 @@ def create_sample_goat_image(filename="sample_goat.jpg", width=800, height=600):
     
     leg_start_y = start_y + goat_height
     
-    for leg_x in [leg1_x, leg2_x, leg3_x, leg4_x]:
-        cv2.rectangle(image, 
-                     (leg_x, leg_start_y), 
-                     (leg_x + leg_width, leg_start_y + leg_height), 
-                     (101, 67, 33), -1)
-        # Hooves
-        cv2.rectangle(image,
-                     (leg_x, leg_start_y + leg_height),
-                     (leg_x + leg_width, leg_start_y + leg_height + 10),
-                     (0, 0, 0), -1)
+    # Legs and hooves as stacked rectangles, one fillPoly call each
+    legs_x = np.array([leg1_x, leg2_x, leg3_x, leg4_x])
+    
+    def rectangles(top, bottom):
+        return np.stack([
+            np.stack([legs_x, np.full_like(legs_x, top)], axis=-1),
+            np.stack([legs_x + leg_width, np.full_like(legs_x, top)], axis=-1),
+            np.stack([legs_x + leg_width, np.full_like(legs_x, bottom)], axis=-1),
+            np.stack([legs_x, np.full_like(legs_x, bottom)], axis=-1),
+        ], axis=1).astype(np.int32)
+    
+    cv2.fillPoly(image, list(rectangles(leg_start_y, leg_start_y + leg_height)), (101, 67, 33))
+    cv2.fillPoly(image, list(rectangles(leg_start_y + leg_height, leg_start_y + leg_height + 10)), (0, 0, 0))
     
     # Tail
     tail_start = (start_x + goat_width//2, start_y + goat_height//2)
@@ -126,7 +140,7 @@ def create_real_goat_recommendations():
     """
     Create an info image with tips for taking real goat photos
     """
-    info_img = np.ones((600, 800, 3), dtype=np.uint8) * 240  # Light background
+    info_img = np.full((600, 800, 3), 240, dtype=np.uint8)  # Light background
     
     # Title
     cv2.putText(info_img, "Perfect Goat Photo Guidelines", (50, 50), 
@@ -163,26 +177,12 @@ def create_real_goat_recommendations():
     return info_img
 
 
-def main():
-    """Generate sample images for testing"""
-    # Create media directories if they don't exist
-    os.makedirs("media/goat_images/samples", exist_ok=True)
-    
-    print("Generating sample goat image...")
-    sample_goat = create_sample_goat_image()
-    cv2.imwrite("media/goat_images/samples/sample_goat_profile.jpg", sample_goat)
-    print("✓ Created: media/goat_images/samples/sample_goat_profile.jpg")
-    
-    print("Generating photo guidelines image...")
-    guidelines_img = create_real_goat_recommendations()
-    cv2.imwrite("media/goat_images/samples/photo_guidelines.jpg", guidelines_img)
-    print("✓ Created: media/goat_images/samples/photo_guidelines.jpg")
-    
-    # Create a simple test pattern that should definitely be detected
-    print("Generating detection test pattern...")
-    test_pattern = np.ones((400, 600, 3), dtype=np.uint8) * 255
+def create_detection_test_pattern():
+    """
+    Create a simple human-like figure that MediaPipe should detect
+    """
+    test_pattern = np.full((400, 600, 3), 255, dtype=np.uint8)
     
-    # Draw a simple human-like figure that MediaPipe should detect
     # Head
     cv2.circle(test_pattern, (300, 80), 30, (0, 0, 0), -1)
     # Body
@@ -194,8 +194,50 @@ def main():
     cv2.line(test_pattern, (300, 250), (270, 320), (0, 0, 0), 10)
     cv2.line(test_pattern, (300, 250), (330, 320), (0, 0, 0), 10)
     
-    cv2.imwrite("media/goat_images/samples/detection_test.jpg", test_pattern)
-    print("✓ Created: media/goat_images/samples/detection_test.jpg")
+    return test_pattern
+
+
+@lru_cache(maxsize=None)
+def script_source():
+    """Source of this script, read once per run for the sample cache keys"""
+    with open(__file__, 'rb') as script:
+        return script.read()
+
+
+def write_sample_image(path, draw, *args):
+    """
+    Write draw(*args) to path. The drawings are deterministic, so the JPEG from
+    an earlier run is copied when neither the parameters nor this script changed
+    """
+    key = hashlib.sha1(script_source() + repr((draw.__name__, args)).encode()).hexdigest()
+    cached_path = os.path.join(CACHE_DIR, f"{key}.jpg")
+    
+    if not os.path.exists(cached_path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        cv2.imwrite(cached_path, draw(*args))
+    
+    shutil.copyfile(cached_path, path)
+
+
+def main():
+    """Generate sample images for testing"""
+    # Create media directories if they don't exist (before the workers start)
+    os.makedirs("media/goat_images/samples", exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    
+    # Drawing and JPEG encoding release the GIL, so the three samples are written concurrently
+    samples = [
+        ("media/goat_images/samples/sample_goat_profile.jpg", create_sample_goat_image),
+        ("media/goat_images/samples/photo_guidelines.jpg", create_real_goat_recommendations),
+        ("media/goat_images/samples/detection_test.jpg", create_detection_test_pattern),
+    ]
+    
+    print("Generating sample images...")
+    with ThreadPoolExecutor(max_workers=len(samples)) as executor:
+        futures = [executor.submit(write_sample_image, path, draw) for path, draw in samples]
+        for (path, _), future in zip(samples, futures):
+            future.result()
+            print(f"✓ Created: {path}")
     
     print("\nSample images created successfully!")
     print("You can now test these images with the GoatMorpho system:")
@@ -1,12 +1,17 @@
 import os
 import sys
-import io
-from dotenv import load_dotenv
+import logging
+from decouple import config
+from importlib.util import find_spec
 from pathlib import Path
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-# Load environment variables from .env file
-load_dotenv()
+# Management commands print emoji; switch stdout to UTF-8 in place only when the
+# console isn't already (set PYTHONUTF8=1 to skip this). Captured streams are left alone
+if (getattr(sys.stdout, 'encoding', None) or '').lower() not in ('utf-8', 'utf8') and hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Settings are read from the environment, falling back to a .env file, and cast to
+# their declared types here so a malformed value fails at startup
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,10 +21,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-w_&2ei37mfaexa#u!u&10((7*3$a-&+oe7!84paf9d*pn@5oc!')
+SECRET_KEY = config('DJANGO_SECRET_KEY', default='django-insecure-w_&2ei37mfaexa#u!u&10((7*3$a-&+oe7!84paf9d*pn@5oc!')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get('DJANGO_DEBUG', 'False').lower() == 'true'
+DEBUG = config('DJANGO_DEBUG', default=False, cast=bool)
 
 ALLOWED_HOSTS = [
     'goatmorpho.info',  # Your primary domain
@@ -43,6 +48,7 @@ INSTALLED_APPS = [
     
     # Third party apps
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
     
     # Local apps
@@ -51,9 +57,12 @@ INSTALLED_APPS = [
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
+    # Token first: requests carrying a token are authenticated from the cache without
+    # loading the session or running CSRF checks. The site's own pages call the API
+    # with their session cookie, so session auth stays as the fallback
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'measurements.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -67,6 +76,11 @@ REST_FRAMEWORK = {
         'user': '1000/hour',
         'upload': '50/hour',  # Special rate for image uploads
     },
+    # The browsable API is only offered while developing
+    'DEFAULT_RENDERER_CLASSES': [
+        'measurements.renderers.ORJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
 }
@@ -74,6 +88,8 @@ REST_FRAMEWORK = {
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Serves collected static files straight from the worker, before sessions and auth run
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -107,6 +123,7 @@ WSGI_APPLICATION = 'goat_morpho.wsgi.application'
 # Uncomment below for PostgreSQL in production
 # if 'test' in sys.argv or os.environ.get('TESTING') or os.environ.get('DJANGO_DEBUG', 'False').lower() == 'true':
 #     # Use SQLite for testing and development
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -115,9 +132,41 @@ DATABASES = {
         'PASSWORD': '123456789',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Reuse each worker's connection across requests instead of reconnecting every
+        # time; kept short so idle workers don't pin Postgres backends for long
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        # Behind pgbouncer in transaction pooling mode, server-side cursors must be off
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {
+            'sslmode': config('DB_SSLMODE', default='prefer'),
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+        },
     }
 }
 
+# Session parameters sent in the startup packet, so they cost no extra SET round trip.
+# A runaway query or an abandoned transaction can't hold a worker (and its locks)
+# indefinitely, and JIT is off since its compile time outweighs these short queries.
+# pgbouncer rejects unknown startup parameters, so there they belong in the role config
+if not DB_PGBOUNCER:
+    DATABASES['default']['OPTIONS']['options'] = ' '.join([
+        f"-c statement_timeout={config('DB_STATEMENT_TIMEOUT', default=30000, cast=int)}",
+        f"-c idle_in_transaction_session_timeout={config('DB_IDLE_IN_TRANSACTION_TIMEOUT', default=30000, cast=int)}",
+        '-c jit=off',
+    ])
+
+# psycopg 3 connection pool: threads in a worker share a few open connections instead
+# of each holding its own. The pool manages connection lifetime, so Django's persistent
+# connections are turned off. Not needed behind pgbouncer, which already pools
+if config('DB_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=4, cast=int),
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -144,7 +193,9 @@ LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
 
-USE_I18N = True
+# The site is English-only and ships no translations; without i18n Django skips the
+# translation catalog lookups in templates, forms and the admin
+USE_I18N = False
 
 USE_TZ = True
 
@@ -158,6 +209,22 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# collectstatic writes content-hashed, precompressed copies that WhiteNoise serves with
+# far-future immutable headers. Development and test runs resolve {% static %} without
+# a manifest, so they keep the plain storage
+TESTING = 'test' in sys.argv or 'pytest' in sys.modules
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG or TESTING
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
 # Media files (Uploaded content)
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -167,19 +234,6 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Django REST Framework settings
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
-    ],
-    'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.IsAuthenticated',
-    ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
-}
-
 # CORS settings (for frontend integration)
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React default
@@ -191,26 +245,34 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+# Only the API is called cross-origin; pages, admin and static files skip the CORS checks
+CORS_URLS_REGEX = r'^/api/'
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+# Uploads above this size are streamed to a temporary file instead of being held in
+# memory, so a batch of large images doesn't sit in the worker's RSS; storage then
+# moves the temporary file into place rather than copying it
+FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=1048576, cast=int)  # 1MB
+FILE_UPLOAD_TEMP_DIR = config('FILE_UPLOAD_TEMP_DIR', default='') or None  # e.g. a tmpfs mount
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB of non-file form data
 
 # Email settings
-EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
-EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
-EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
-EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
-EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True').lower() == 'true'
-DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@goatmorpho.info')
+EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@goatmorpho.info')
 
 # Enhanced Redis Configuration with Production-Ready Settings
-REDIS_HOST = os.environ.get('REDIS_HOST', '127.0.0.1')
-REDIS_PORT = int(os.environ.get('REDIS_PORT', '6379'))
-REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD', '')
-REDIS_DB = int(os.environ.get('REDIS_DB', '1'))
-REDIS_TIMEOUT = int(os.environ.get('REDIS_TIMEOUT', '5'))
-REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', '50'))
+REDIS_HOST = config('REDIS_HOST', default='127.0.0.1')
+REDIS_PORT = config('REDIS_PORT', default=6379, cast=int)
+REDIS_PASSWORD = config('REDIS_PASSWORD', default='')
+REDIS_DB = config('REDIS_DB', default=1, cast=int)
+REDIS_TIMEOUT = config('REDIS_TIMEOUT', default=5, cast=int)
+# The pool is per worker process and each sync worker serves one request at a time,
+# so a handful of connections covers it without idle sockets piling up on Redis
+REDIS_MAX_CONNECTIONS = config('REDIS_MAX_CONNECTIONS', default=8, cast=int)
 
 # Build Redis URL with authentication
 if REDIS_PASSWORD:
@@ -218,44 +280,64 @@ if REDIS_PASSWORD:
 else:
     REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
+# Single-instance deploys can skip Redis entirely and use the in-process LocMem cache.
+# Availability is checked with find_spec, which locates the packages without importing
+# them: the cache backend imports django_redis by dotted path when it is first used
+USE_REDIS = config('USE_REDIS', default=True, cast=bool) and find_spec('django_redis') is not None
+
 # Production-Ready Cache Configuration
-try:
-    import django_redis
+if USE_REDIS:
+    # MessagePack + LZ4 when both are installed: cheaper to encode and compress than
+    # JSON + zlib. The version keeps the two formats from reading each other's entries
+    if find_spec('msgpack') is not None and find_spec('lz4') is not None:
+        REDIS_SERIALIZER = 'measurements.cache_serializers.MSGPackSerializer'
+        REDIS_COMPRESSOR = 'django_redis.compressors.lz4.Lz4Compressor'
+        REDIS_CACHE_VERSION = 2
+    else:
+        REDIS_SERIALIZER = 'django_redis.serializers.json.JSONSerializer'
+        REDIS_COMPRESSOR = 'django_redis.compressors.zlib.ZlibCompressor'
+        REDIS_CACHE_VERSION = 1
+    
     CACHES = {
         'default': {
             'BACKEND': 'django_redis.cache.RedisCache',
             'LOCATION': REDIS_URL,
             'OPTIONS': {
                 'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # Callers beyond max_connections wait briefly for a free connection
+                # instead of failing with ConnectionError
+                'CONNECTION_POOL_CLASS': 'redis.BlockingConnectionPool',
                 'CONNECTION_POOL_KWARGS': {
                     'max_connections': REDIS_MAX_CONNECTIONS,
+                    'timeout': config('REDIS_POOL_TIMEOUT', default=1.0, cast=float),
                     'retry_on_timeout': True,
                     'socket_connect_timeout': REDIS_TIMEOUT,
                     'socket_timeout': REDIS_TIMEOUT,
                     'health_check_interval': 30,
                 },
-                'SERIALIZER': 'django_redis.serializers.json.JSONSerializer',
-                'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
+                'SERIALIZER': REDIS_SERIALIZER,
+                'COMPRESSOR': REDIS_COMPRESSOR,
+                # A flapping Redis behaves like cache misses (served from the database) rather than 500s
+                'IGNORE_EXCEPTIONS': True,
             },
             'KEY_PREFIX': 'goatmorpho',
-            'VERSION': 1,
-            'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', '300')),
+            'VERSION': REDIS_CACHE_VERSION,
+            'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
         }
     }
     
+    DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+    
     # Hybrid Session Configuration (Redis + Database fallback)
-    if os.environ.get('REDIS_SESSIONS_ONLY', 'False').lower() == 'true':
+    if config('REDIS_SESSIONS_ONLY', default=False, cast=bool):
         SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
         SESSION_CACHE_ALIAS = 'default'
     else:
         # Safer: Cache-backed database sessions
         SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
-        SESSION_SAVE_EVERY_REQUEST = False
     
-    SESSION_COOKIE_AGE = int(os.environ.get('SESSION_COOKIE_AGE', '1209600'))  # 2 weeks
-    
-except ImportError:
-    # Enhanced fallback configuration
+else:
+    # Enhanced fallback configuration (per-process LocMem, no network round trip)
     CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -269,40 +351,61 @@ except ImportError:
     }
     # Use database sessions as fallback
     SESSION_ENGINE = 'django.contrib.sessions.backends.db'
-    SESSION_SAVE_EVERY_REQUEST = False
+
+# Deployments can pick the session engine outright. With
+# 'django.contrib.sessions.backends.signed_cookies' the session lives in the signed
+# cookie itself, so requests make no cache or database round trip for it (at the cost
+# of sessions not being revocable server-side before they expire)
+SESSION_ENGINE = config('SESSION_ENGINE', default=SESSION_ENGINE)
+# Anonymous sessions are stored for a day; logging in extends the session to
+# AUTHENTICATED_SESSION_AGE (see measurements.signals). Signed cookies are checked
+# against SESSION_COOKIE_AGE itself and cost no server-side write, so they get the long age
+AUTHENTICATED_SESSION_AGE = config('AUTHENTICATED_SESSION_AGE', default=1209600, cast=int)  # 2 weeks
+if SESSION_ENGINE == 'django.contrib.sessions.backends.signed_cookies':
+    SESSION_COOKIE_AGE = AUTHENTICATED_SESSION_AGE
+else:
+    SESSION_COOKIE_AGE = config('SESSION_COOKIE_AGE', default=86400, cast=int)  # 1 day
+SESSION_COOKIE_HTTPONLY = True
+SESSION_COOKIE_SAMESITE = 'Lax'
 
 # CV Processing URL
-CV_PROCESSING_URL = os.environ.get('CV_PROCESSING_URL', 'http://127.0.0.1:8001')
+CV_PROCESSING_URL = config('CV_PROCESSING_URL', default='http://127.0.0.1:8001')
 
 # AI/ML Configuration
 AI_ML_SETTINGS = {
-    'ENABLE_ADVANCED_CV': os.environ.get('ENABLE_ADVANCED_CV', 'True').lower() == 'true',
-    'ENABLE_BREED_MODELS': os.environ.get('ENABLE_BREED_MODELS', 'True').lower() == 'true',
-    'ENABLE_USER_MODELS': os.environ.get('ENABLE_USER_MODELS', 'True').lower() == 'true',
-    'MODEL_DIR': os.path.join(BASE_DIR, 'measurements', 'ml_models'),
-    'MIN_TRAINING_SAMPLES': int(os.environ.get('MIN_TRAINING_SAMPLES', '50')),
-    'DEFAULT_CONFIDENCE_THRESHOLD': float(os.environ.get('CONFIDENCE_THRESHOLD', '0.7')),
-    'ENABLE_UNCERTAINTY_QUANTIFICATION': os.environ.get('ENABLE_UNCERTAINTY', 'True').lower() == 'true',
-    'BOOTSTRAP_SAMPLES': int(os.environ.get('BOOTSTRAP_SAMPLES', '50')),
-    'ANOMALY_DETECTION_CONTAMINATION': float(os.environ.get('ANOMALY_CONTAMINATION', '0.1')),
-    'AUTO_RETRAIN_MODELS': os.environ.get('AUTO_RETRAIN_MODELS', 'False').lower() == 'true',
-    'RETRAIN_THRESHOLD_DAYS': int(os.environ.get('RETRAIN_THRESHOLD_DAYS', '30')),
+    'ENABLE_ADVANCED_CV': config('ENABLE_ADVANCED_CV', default=True, cast=bool),
+    'ENABLE_BREED_MODELS': config('ENABLE_BREED_MODELS', default=True, cast=bool),
+    'ENABLE_USER_MODELS': config('ENABLE_USER_MODELS', default=True, cast=bool),
+    'MODEL_DIR': BASE_DIR / 'measurements' / 'ml_models',
+    # Model weights are memory-mapped read-only so workers share them; empty loads into memory
+    'MODEL_MMAP_MODE': config('MODEL_MMAP_MODE', default='r') or None,
+    'MIN_TRAINING_SAMPLES': config('MIN_TRAINING_SAMPLES', default=50, cast=int),
+    'DEFAULT_CONFIDENCE_THRESHOLD': config('CONFIDENCE_THRESHOLD', default=0.7, cast=float),
+    'ENABLE_UNCERTAINTY_QUANTIFICATION': config('ENABLE_UNCERTAINTY', default=True, cast=bool),
+    'BOOTSTRAP_SAMPLES': config('BOOTSTRAP_SAMPLES', default=50, cast=int),
+    'ANOMALY_DETECTION_CONTAMINATION': config('ANOMALY_CONTAMINATION', default=0.1, cast=float),
+    'AUTO_RETRAIN_MODELS': config('AUTO_RETRAIN_MODELS', default=False, cast=bool),
+    'RETRAIN_THRESHOLD_DAYS': config('RETRAIN_THRESHOLD_DAYS', default=30, cast=int),
 }
 
 # Image Processing Configuration
 IMAGE_PROCESSING_SETTINGS = {
-    'ENABLE_IMAGE_ENHANCEMENT': os.environ.get('ENABLE_IMAGE_ENHANCEMENT', 'True').lower() == 'true',
-    'ENABLE_ENSEMBLE_DETECTION': os.environ.get('ENABLE_ENSEMBLE_DETECTION', 'True').lower() == 'true',
-    'MIN_IMAGE_QUALITY_SCORE': float(os.environ.get('MIN_IMAGE_QUALITY', '0.3')),
-    'MAX_IMAGE_SIZE': int(os.environ.get('MAX_IMAGE_SIZE', '1920')),
-    'ENABLE_BLUR_DETECTION': os.environ.get('ENABLE_BLUR_DETECTION', 'True').lower() == 'true',
-    'ENABLE_CONTRAST_ENHANCEMENT': os.environ.get('ENABLE_CONTRAST_ENHANCEMENT', 'True').lower() == 'true',
+    'ENABLE_IMAGE_ENHANCEMENT': config('ENABLE_IMAGE_ENHANCEMENT', default=True, cast=bool),
+    'ENABLE_ENSEMBLE_DETECTION': config('ENABLE_ENSEMBLE_DETECTION', default=True, cast=bool),
+    'MIN_IMAGE_QUALITY_SCORE': config('MIN_IMAGE_QUALITY', default=0.3, cast=float),
+    'MAX_IMAGE_SIZE': config('MAX_IMAGE_SIZE', default=1920, cast=int),
+    'ENABLE_BLUR_DETECTION': config('ENABLE_BLUR_DETECTION', default=True, cast=bool),
+    'ENABLE_CONTRAST_ENHANCEMENT': config('ENABLE_CONTRAST_ENHANCEMENT', default=True, cast=bool),
+    # MediaPipe pose model: 0 = lite, 1 = full, 2 = heavy (most accurate, slowest on CPU-only hosts)
+    'POSE_MODEL_COMPLEXITY': config('POSE_MODEL_COMPLEXITY', default=2, cast=int),
+    # OpenCV threads per process; every web worker already occupies a core
+    'OPENCV_THREADS': config('OPENCV_THREADS', default=1, cast=int),
 }
 
 # Performance Monitoring
 PERFORMANCE_MONITORING = {
-    'TRACK_PROCESSING_TIME': os.environ.get('TRACK_PROCESSING_TIME', 'True').lower() == 'true',
-    'TRACK_MODEL_PERFORMANCE': os.environ.get('TRACK_MODEL_PERFORMANCE', 'True').lower() == 'true',
+    'TRACK_PROCESSING_TIME': config('TRACK_PROCESSING_TIME', default=True, cast=bool),
+    'TRACK_MODEL_PERFORMANCE': config('TRACK_MODEL_PERFORMANCE', default=True, cast=bool),
     'PERFORMANCE_LOG_FILE': os.path.join(BASE_DIR, 'ai_performance.log'),
 }
 
@@ -310,27 +413,45 @@ PERFORMANCE_MONITORING = {
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    # dictConfig sets handlers up in name order: each handler sorts after the ones it feeds
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'logging.handlers.WatchedFileHandler',
             'filename': BASE_DIR / 'goat_morpho.log',
+            # Open on the first record, so workers that never log hold no descriptor.
+            # Rotation is left to logrotate (several workers rotating one file would
+            # race); the watched handler reopens the file once it has been rotated
+            'delay': True,
+        },
+        # Batches file writes: flushed every 1000 records, on ERROR, or after 30 seconds
+        'file_buffered': {
+            'class': 'measurements.log_handlers.TimedMemoryHandler',
+            'capacity': 1000,
+            'flushLevel': logging.ERROR,
+            'flush_interval': 30,
+            'target': 'file',
         },
         'console': {
-            'level': 'DEBUG',
+            'level': 'DEBUG' if DEBUG else 'INFO',
             'class': 'logging.StreamHandler',
         },
+        # Request threads only enqueue; a listener thread does the console and file I/O
+        'queue': {
+            '()': 'measurements.log_handlers.QueueListenerHandler',
+            'handlers': ['cfg://handlers.file_buffered', 'cfg://handlers.console'],
+        },
     },
     'loggers': {
         'measurements': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'INFO',
-            'propagate': True,
+            'propagate': False,
         },
         'django': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'INFO',
-            'propagate': True,
+            'propagate': False,
         },
     },
 }
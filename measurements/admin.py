@@ -1,6 +1,11 @@
+import operator
+from functools import reduce
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
+from django.db.models import Q
+from django.utils.text import smart_split, unescape_string_literal
 from .models import Goat, MorphometricMeasurement, KeyPoint, MeasurementSession, UserProfile
 
 
@@ -15,6 +20,7 @@ class CustomUserAdmin(UserAdmin):
     """Extended User admin with profile"""
     inlines = (UserProfileInline,)
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'get_organization')
+    list_select_related = ('userprofile',)
     
     def get_organization(self, obj):
         try:
@@ -29,12 +35,48 @@ admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
 
 
+class SplitJoinSearchMixin:
+    """
+    Admin search that matches the search_fields of each table in its own subquery and
+    unions the matching pks. Django ORs every field into one WHERE clause, and an OR
+    spanning a join keeps PostgreSQL off single-table indexes such as the goat trigram
+    indexes (migration 0006). Every word still has to match; the results equal the
+    stock search as long as the joins follow foreign keys, as they do below
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        # Fields grouped by the relation they are reached through ('' for own columns)
+        groups = {}
+        for field in search_fields:
+            groups.setdefault(field.rpartition('__')[0], []).append(field)
+        if (not search_term or len(groups) < 2
+                or any(field.startswith(('^', '=', '@')) for field in search_fields)):
+            return super().get_search_results(request, queryset, search_term)
+
+        for term in smart_split(search_term):
+            if term.startswith(('"', "'")) and term[0] == term[-1]:
+                term = unescape_string_literal(term)
+            matches = [
+                self.model._default_manager.filter(
+                    reduce(operator.or_, (Q(**{f'{field}__icontains': term}) for field in fields))
+                ).order_by().values('pk')
+                for fields in groups.values()
+            ]
+            queryset = queryset.filter(pk__in=matches[0].union(*matches[1:]))
+        return queryset, False
+
+
 @admin.register(Goat)
-class GoatAdmin(admin.ModelAdmin):
+class GoatAdmin(SplitJoinSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'breed', 'sex', 'age_months', 'weight_kg', 'owner', 'created_at']
     list_filter = ['sex', 'breed', 'created_at']
+    list_select_related = ['owner']
     search_fields = ['name', 'breed', 'owner__username']
     readonly_fields = ['id', 'created_at', 'updated_at']
+    list_per_page = 25
+    list_max_show_all = 200
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Information', {
@@ -56,15 +98,19 @@ class KeyPointInline(admin.TabularInline):
 
 
 @admin.register(MorphometricMeasurement)
-class MorphometricMeasurementAdmin(admin.ModelAdmin):
+class MorphometricMeasurementAdmin(SplitJoinSearchMixin, admin.ModelAdmin):
     list_display = [
         'goat', 'measurement_date', 'measurement_method', 
         'confidence_score', 'hauteur_au_garrot', 'body_length'
     ]
     list_filter = ['measurement_method', 'measurement_date', 'goat__sex']
+    list_select_related = ['goat', 'measured_by']
     search_fields = ['goat__name', 'measured_by__username']
     readonly_fields = ['id', 'measurement_date', 'confidence_score']
     inlines = [KeyPointInline]
+    list_per_page = 25
+    list_max_show_all = 200
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Information', {
@@ -89,28 +135,31 @@ class MorphometricMeasurementAdmin(admin.ModelAdmin):
             'fields': ('confidence_score', 'reference_object_length_cm', 'notes')
         }),
     )
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('goat', 'measured_by')
 
 
 @admin.register(KeyPoint)
-class KeyPointAdmin(admin.ModelAdmin):
+class KeyPointAdmin(SplitJoinSearchMixin, admin.ModelAdmin):
     list_display = ['measurement', 'name', 'x_coordinate', 'y_coordinate', 'confidence', 'manually_adjusted']
     list_filter = ['name', 'manually_adjusted', 'measurement__measurement_date']
+    list_select_related = ['measurement__goat']
     search_fields = ['measurement__goat__name', 'name']
     readonly_fields = ['confidence']
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('measurement', 'measurement__goat')
+    raw_id_fields = ['measurement']
+    list_per_page = 25
+    list_max_show_all = 200
+    show_full_result_count = False
 
 
 @admin.register(MeasurementSession)
 class MeasurementSessionAdmin(admin.ModelAdmin):
     list_display = ['session_name', 'user', 'created_at', 'completed_at']
     list_filter = ['created_at', 'completed_at']
+    list_select_related = ['user']
     search_fields = ['session_name', 'user__username']
     readonly_fields = ['id', 'created_at']
+    list_per_page = 25
+    list_max_show_all = 200
+    show_full_result_count = False
     
     fieldsets = (
         ('Session Information', {
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+# Token -> user lookups are cached for this many seconds
+TOKEN_CACHE_TIMEOUT = 300
+
+# User columns kept in the cache (in model field order, as Model.from_db expects).
+# Covers UserSerializer's fields; anything else is loaded lazily on access
+CACHED_USER_FIELDS = (
+    'id', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+    'is_staff', 'is_active'
+)
+
+
+def token_cache_key(key):
+    """Cache key for an auth token"""
+    return f'authtok_{key}'
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that caches the token -> user mapping so authenticated
+    API requests skip the auth token SELECT + JOIN on every call
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        values = cache.get(cache_key)
+
+        if values is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+            user = token.user
+            values = [getattr(user, field) for field in CACHED_USER_FIELDS]
+            cache.set(cache_key, values, TOKEN_CACHE_TIMEOUT)
+        else:
+            # Rebuild a deferred instance: saving it only touches the cached columns
+            user = User.from_db('default', CACHED_USER_FIELDS, values)
+            token = self.get_model()(key=key, user=user)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, token)
@@ -0,0 +1,21 @@
+import msgpack
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.serializers.base import BaseSerializer
+
+
+class MSGPackSerializer(BaseSerializer):
+    """
+    MessagePack serializer for the Redis cache. Values msgpack has no type for
+    (datetimes, UUIDs, Decimals, lazy strings) are stored the way the JSON
+    serializer stored them, so cached payloads read back unchanged
+    """
+
+    def __init__(self, options):
+        super().__init__(options=options)
+        self.encoder = DjangoJSONEncoder()
+
+    def dumps(self, value):
+        return msgpack.packb(value, default=self.encoder.default, use_bin_type=True)
+
+    def loads(self, value):
+        return msgpack.unpackb(value, raw=False, strict_map_key=False)
@@ -3,14 +3,133 @@ import numpy as np
 import mediapipe as mp
 from PIL import Image
 import math
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
 import io
 import logging
+import struct
+import threading
+from functools import cached_property
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Web workers are separate processes; stop each one from starting an OpenCV pool sized to every core
+cv2.setNumThreads(settings.IMAGE_PROCESSING_SETTINGS.get('OPENCV_THREADS', 1))
+
+# Keypoint-to-keypoint measurements: (measurement field, from keypoint, to keypoint,
+# vertical only). Vertical ones measure the height difference, the rest the straight line
+DISTANCE_MEASUREMENTS = (
+    # Hauteur au garrot (wither height), approximated by shoulder height
+    ('hauteur_au_garrot', 'left_shoulder', 'left_ankle', True),
+    ('body_length', 'left_shoulder', 'left_hip', False),
+    ('longueur_tete', 'nose', 'left_ear', False),
+    ('largeur_tete', 'left_ear', 'right_ear', False),
+    ('largeur_poitrine', 'left_shoulder', 'right_shoulder', False),
+    ('largeur_hanche', 'left_hip', 'right_hip', False),
+    ('longueur_cou', 'left_shoulder', 'nose', False),
+)
+
+# Longest side of the copy handed to MediaPipe; its detector and landmark models
+# run at 224-256px, so larger inputs only make its own resize step slower
+DETECTION_MAX_SIZE = 640
+
+# Protobuf wire layout of a landmark list entry carrying exactly x, y, z and visibility:
+# the list's field 1 (tag 0x0a, 20 byte payload), then four tagged little-endian floats
+LANDMARK_WIRE_DTYPE = np.dtype([
+    ('tag', 'u1'), ('length', 'u1'),
+    ('x_tag', 'u1'), ('x', '<f4'),
+    ('y_tag', 'u1'), ('y', '<f4'),
+    ('z_tag', 'u1'), ('z', '<f4'),
+    ('visibility_tag', 'u1'), ('visibility', '<f4'),
+])
+LANDMARK_WIRE_TAG_COLUMNS = np.array([0, 1, 2, 7, 12, 17])
+LANDMARK_WIRE_TAGS = np.array([0x0A, 20, 0x0D, 0x15, 0x1D, 0x25], dtype=np.uint8)
+
+# JPEG start-of-frame markers (they carry the image dimensions)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# libjpeg can downscale by these factors while decoding, skipping most of the IDCT work
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Bytes read from the start of an image file to find the JPEG frame header; it follows
+# the APP segments, and an EXIF segment is at most 64KB
+JPEG_HEADER_READ_SIZE = 128 * 1024
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from a JPEG header without decoding it"""
+    if data[:2] != b'\xff\xd8':
+        return None
+    
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            # Fill byte
+            i += 1
+        elif marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[i + 5:i + 9])
+            return width, height
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Standalone markers have no length field
+            i += 2
+        else:
+            i += 2 + struct.unpack('>H', data[i + 2:i + 4])[0]
+    return None
+
+
+def _decode_flags(header: bytes, max_width: int, max_height: int) -> int:
+    """
+    imread/imdecode flags for an image starting with these bytes: large JPEGs are
+    downscaled by the decoder itself, as far as possible while staying at least as
+    big as the later resize target
+    """
+    size = _jpeg_size(header)
+    if size:
+        width, height = size
+        # The EXIF orientation may swap the axes, so use the less aggressive of the two
+        scale = max(min(max_width / width, max_height / height),
+                    min(max_width / height, max_height / width))
+        for factor, reduced_flag in REDUCED_DECODE_FLAGS:
+            if factor * scale <= 1:
+                return reduced_flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image(data: bytes, max_width: int, max_height: int) -> Optional[np.ndarray]:
+    """Decode image bytes to BGR, letting libjpeg do most of the downscale"""
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), _decode_flags(data, max_width, max_height))
+
+
+def read_image(path: str, max_width: int, max_height: int) -> Optional[np.ndarray]:
+    """
+    decode_image for an image on disk: only the header is read in Python, and
+    OpenCV decodes the file itself
+    """
+    with open(path, 'rb') as image_file:
+        header = image_file.read(JPEG_HEADER_READ_SIZE)
+    return cv2.imread(path, _decode_flags(header, max_width, max_height))
+
+
+def downscale_for_detection(image: np.ndarray) -> np.ndarray:
+    """
+    Copy of the image small enough for MediaPipe. Its landmarks and boxes come
+    back normalized, so they still map onto the full-size image
+    """
+    height, width = image.shape[:2]
+    scale = DETECTION_MAX_SIZE / max(height, width)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+
 
 class GoatMorphometryProcessor:
     """
@@ -23,26 +142,19 @@ class GoatMorphometryProcessor:
             self.mp_pose = mp.solutions.pose
             self.pose = self.mp_pose.Pose(
                 static_image_mode=True,
-                model_complexity=2,
+                model_complexity=settings.IMAGE_PROCESSING_SETTINGS.get('POSE_MODEL_COMPLEXITY', 2),
                 enable_segmentation=False,  # Disable segmentation to reduce errors
                 min_detection_confidence=0.1  # Very low confidence threshold for animals
             )
             self.mp_drawing = mp.solutions.drawing_utils
-            
-            # Also initialize MediaPipe face detection for better animal detection
             self.mp_face_detection = mp.solutions.face_detection
-            self.face_detection = self.mp_face_detection.FaceDetection(
-                model_selection=0, min_detection_confidence=0.1
-            )
-            
-            # Initialize MediaPipe selfie segmentation as backup
             self.mp_selfie_segmentation = mp.solutions.selfie_segmentation
-            self.selfie_segmentation = self.mp_selfie_segmentation.SelfieSegmentation(
-                model_selection=1
-            )
             
             logger.info("MediaPipe initialized successfully")
             
+            # CLAHE operator for the low-contrast retry, built once instead of per image
+            self.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+            
             # Define goat-specific keypoints mapping
             self.goat_keypoints = {
                 'nose': 0,
@@ -63,42 +175,68 @@ class GoatMorphometryProcessor:
                 'left_ankle': 27,
                 'right_ankle': 28,
             }
+            self._keypoint_names = np.array(list(self.goat_keypoints))
+            self._keypoint_indices = np.fromiter(self.goat_keypoints.values(), dtype=np.intp)
         except Exception as e:
             logger.error(f"Error initializing MediaPipe: {e}")
             raise
     
-    def process_image(self, image_path: str, reference_length_cm: Optional[float] = None) -> Dict:
+    @cached_property
+    def face_detection(self):
+        """
+        MediaPipe face detection for the fallback when pose detection fails.
+        Built on first use, so workers that never hit the fallback don't load its graph
+        """
+        return self.mp_face_detection.FaceDetection(
+            model_selection=0, min_detection_confidence=0.1
+        )
+    
+    @cached_property
+    def selfie_segmentation(self):
+        """MediaPipe selfie segmentation as a further backup, built on first use"""
+        return self.mp_selfie_segmentation.SelfieSegmentation(
+            model_selection=1
+        )
+    
+    def process_image(self, image_path: Union[str, np.ndarray], reference_length_cm: Optional[float] = None,
+                      annotate: bool = True) -> Dict:
         """
         Process goat image to extract morphometric measurements
         
         Args:
-            image_path: Path to the goat image
+            image_path: Path to the goat image, or an already decoded BGR image
             reference_length_cm: Known length of reference object in cm for scaling
+            annotate: Whether to draw the annotated 'processed_image'; callers that
+                don't store it can skip the copy and drawing
             
         Returns:
             Dictionary containing measurements and keypoints
         """
         try:
-            # Load and process image
-            image = cv2.imread(image_path)
+            # Load and process image (skip the disk read when handed a decoded array)
+            if isinstance(image_path, np.ndarray):
+                image = image_path
+            else:
+                image = cv2.imread(image_path)
             if image is None:
                 raise ValueError(f"Could not load image from {image_path}")
             
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            detection_rgb = downscale_for_detection(image_rgb)
             
             # Try pose detection first
-            results = self.pose.process(image_rgb)
+            results = self.pose.process(detection_rgb)
             
             if not results.pose_landmarks:
                 # Fallback 1: Try with different image preprocessing
                 logger.info("Initial pose detection failed, trying with enhanced contrast...")
-                enhanced_image = self._enhance_image_for_detection(image_rgb)
+                enhanced_image = self._enhance_image_for_detection(detection_rgb)
                 results = self.pose.process(enhanced_image)
                 
                 if not results.pose_landmarks:
                     # Fallback 2: Try face detection and estimate body landmarks
                     logger.info("Pose detection failed, trying face detection fallback...")
-                    return self._fallback_face_detection(image_rgb, reference_length_cm)
+                    return self._fallback_face_detection(image_rgb, reference_length_cm, annotate)
             
             if not results.pose_landmarks:
                 return {
@@ -110,7 +248,8 @@ class GoatMorphometryProcessor:
                 }
             
             # Extract keypoints
-            keypoints = self._extract_keypoints(results.pose_landmarks, image.shape)
+            landmarks = self._landmarks_to_array(results.pose_landmarks)
+            keypoints = self._extract_keypoints(landmarks, image.shape)
             
             # Calculate scale factor if reference object is provided
             scale_factor = self._calculate_scale_factor(keypoints, reference_length_cm) if reference_length_cm else 1.0
@@ -118,20 +257,22 @@ class GoatMorphometryProcessor:
             # Calculate morphometric measurements
             measurements = self._calculate_measurements(keypoints, scale_factor)
             
-            # Generate processed image with annotations
-            processed_image = self._annotate_image(image.copy(), results.pose_landmarks)
-            
             # Calculate overall confidence score
-            confidence_score = self._calculate_confidence(results.pose_landmarks)
+            confidence_score = self._calculate_confidence(landmarks)
             
-            return {
+            result = {
                 'success': True,
                 'measurements': measurements,
                 'keypoints': keypoints,
                 'confidence_score': confidence_score,
-                'processed_image': processed_image,
                 'scale_factor': scale_factor
             }
+            if annotate:
+                # Generate processed image with annotations, drawing straight onto the frame
+                # we decoded (only an array handed in by the caller needs copying first)
+                canvas = image.copy() if image is image_path else image
+                result['processed_image'] = self._annotate_image(canvas, results.pose_landmarks)
+            return result
             
         except Exception as e:
             return {
@@ -142,23 +283,41 @@ class GoatMorphometryProcessor:
                 'confidence_score': 0.0
             }
     
-    def _extract_keypoints(self, pose_landmarks, image_shape) -> List[Dict]:
-        """Extract keypoint coordinates from pose landmarks"""
+    def _extract_keypoints(self, landmarks: np.ndarray, image_shape) -> List[Dict]:
+        """Extract keypoint coordinates from the (N, 4) landmark array"""
         height, width = image_shape[:2]
-        keypoints = []
         
-        for name, idx in self.goat_keypoints.items():
-            if idx < len(pose_landmarks.landmark):
-                landmark = pose_landmarks.landmark[idx]
-                keypoints.append({
-                    'name': name,
-                    'x': landmark.x * width,
-                    'y': landmark.y * height,
-                    'z': landmark.z,
-                    'visibility': landmark.visibility
-                })
+        # Select the goat keypoints and convert to pixels in one vectorized step
+        present = self._keypoint_indices < len(landmarks)
+        points = landmarks[self._keypoint_indices[present]]
+        points[:, :2] *= (width, height)
         
-        return keypoints
+        return [
+            {'name': name, 'x': x, 'y': y, 'z': z, 'visibility': visibility}
+            for name, (x, y, z, visibility) in zip(self._keypoint_names[present].tolist(), points.tolist())
+        ]
+    
+    @staticmethod
+    def _landmarks_to_array(pose_landmarks) -> np.ndarray:
+        """Pose landmarks as an (N, 4) float32 array of x, y, z, visibility"""
+        count = len(pose_landmarks.landmark)
+        
+        # Read the floats straight out of the serialized message when every landmark
+        # has the plain layout (a zero z, or a presence value, changes it)
+        buffer = pose_landmarks.SerializeToString()
+        if count and len(buffer) == count * LANDMARK_WIRE_DTYPE.itemsize:
+            raw = np.frombuffer(buffer, dtype=np.uint8).reshape(count, -1)
+            if (raw[:, LANDMARK_WIRE_TAG_COLUMNS] == LANDMARK_WIRE_TAGS).all():
+                records = np.frombuffer(buffer, dtype=LANDMARK_WIRE_DTYPE)
+                return np.stack(
+                    [records['x'], records['y'], records['z'], records['visibility']], axis=1
+                )
+        
+        return np.fromiter(
+            (value for lm in pose_landmarks.landmark for value in (lm.x, lm.y, lm.z, lm.visibility)),
+            dtype=np.float32,
+            count=count * 4
+        ).reshape(count, 4)
     
     def _calculate_scale_factor(self, keypoints: List[Dict], reference_length_cm: float) -> float:
         """
@@ -184,69 +343,29 @@ class GoatMorphometryProcessor:
         measurements = {}
         
         # Create keypoint lookup dictionary
-        kp_dict = {kp['name']: kp for kp in keypoints}
+        kp_dict = {kp['name']: (kp['x'], kp['y']) for kp in keypoints}
         
         try:
-            # Height measurements (vertical distances)
-            # Hauteur au garrot (Wither Height) - approximate with shoulder height
-            if 'left_shoulder' in kp_dict and 'left_ankle' in kp_dict:
-                wither_height_px = abs(kp_dict['left_shoulder']['y'] - kp_dict['left_ankle']['y'])
-                measurements['hauteur_au_garrot'] = round(wither_height_px * scale_factor, 2)
-            
-            # Body Length - distance from shoulder to hip
-            if 'left_shoulder' in kp_dict and 'left_hip' in kp_dict:
-                body_length_px = math.sqrt(
-                    (kp_dict['left_shoulder']['x'] - kp_dict['left_hip']['x'])**2 +
-                    (kp_dict['left_shoulder']['y'] - kp_dict['left_hip']['y'])**2
-                )
-                measurements['body_length'] = round(body_length_px * scale_factor, 2)
-            
-            # Head Length - distance from nose to ear
-            if 'nose' in kp_dict and 'left_ear' in kp_dict:
-                head_length_px = math.sqrt(
-                    (kp_dict['nose']['x'] - kp_dict['left_ear']['x'])**2 +
-                    (kp_dict['nose']['y'] - kp_dict['left_ear']['y'])**2
-                )
-                measurements['longueur_tete'] = round(head_length_px * scale_factor, 2)
-            
-            # Head Width - distance between ears
-            if 'left_ear' in kp_dict and 'right_ear' in kp_dict:
-                head_width_px = math.sqrt(
-                    (kp_dict['left_ear']['x'] - kp_dict['right_ear']['x'])**2 +
-                    (kp_dict['left_ear']['y'] - kp_dict['right_ear']['y'])**2
-                )
-                measurements['largeur_tete'] = round(head_width_px * scale_factor, 2)
-            
-            # Chest Width - distance between shoulders
-            if 'left_shoulder' in kp_dict and 'right_shoulder' in kp_dict:
-                chest_width_px = math.sqrt(
-                    (kp_dict['left_shoulder']['x'] - kp_dict['right_shoulder']['x'])**2 +
-                    (kp_dict['left_shoulder']['y'] - kp_dict['right_shoulder']['y'])**2
-                )
-                measurements['largeur_poitrine'] = round(chest_width_px * scale_factor, 2)
-            
-            # Hip Width - distance between hips
-            if 'left_hip' in kp_dict and 'right_hip' in kp_dict:
-                hip_width_px = math.sqrt(
-                    (kp_dict['left_hip']['x'] - kp_dict['right_hip']['x'])**2 +
-                    (kp_dict['left_hip']['y'] - kp_dict['right_hip']['y'])**2
-                )
-                measurements['largeur_hanche'] = round(hip_width_px * scale_factor, 2)
-            
-            # Neck Length - distance from shoulder to head
-            if 'left_shoulder' in kp_dict and 'nose' in kp_dict:
-                neck_length_px = math.sqrt(
-                    (kp_dict['left_shoulder']['x'] - kp_dict['nose']['x'])**2 +
-                    (kp_dict['left_shoulder']['y'] - kp_dict['nose']['y'])**2
-                )
-                measurements['longueur_cou'] = round(neck_length_px * scale_factor, 2)
+            # Every measurement whose keypoints were detected, computed in one NumPy pass
+            pairs = [
+                (field, start, end, vertical) for field, start, end, vertical in DISTANCE_MEASUREMENTS
+                if start in kp_dict and end in kp_dict
+            ]
+            if pairs:
+                coords = np.array([(kp_dict[start], kp_dict[end]) for _, start, end, _ in pairs])
+                vertical = np.array([vertical for *_, vertical in pairs])
+                deltas = coords[:, 0] - coords[:, 1]
+                deltas[vertical, 0] = 0
+                distances = np.hypot(deltas[:, 0], deltas[:, 1]) * scale_factor
+                for (field, *_), distance in zip(pairs, distances.tolist()):
+                    measurements[field] = round(distance, 2)
             
             # Additional measurements can be added here
             # For circumferences and more complex measurements, additional computer vision techniques
             # such as contour detection and 3D reconstruction may be needed
             
         except Exception as e:
-            print(f"Error calculating measurements: {e}")
+            logger.error(f"Error calculating measurements: {e}")
         
         return measurements
     
@@ -265,16 +384,16 @@ class GoatMorphometryProcessor:
         
         return image
     
-    def _calculate_confidence(self, pose_landmarks) -> float:
+    def _calculate_confidence(self, landmarks: np.ndarray) -> float:
         """Calculate overall confidence score based on landmark visibility"""
-        total_visibility = sum(landmark.visibility for landmark in pose_landmarks.landmark)
-        avg_visibility = total_visibility / len(pose_landmarks.landmark)
-        return round(avg_visibility, 3)
+        return round(float(landmarks[:, 3].mean()), 3)
     
     def process_uploaded_image(self, uploaded_file: InMemoryUploadedFile, 
-                             reference_length_cm: Optional[float] = None) -> Dict:
+                             reference_length_cm: Optional[float] = None,
+                             annotate: bool = True) -> Dict:
         """
-        Process uploaded Django file with enhanced error handling
+        Process uploaded Django file with enhanced error handling.
+        With annotate=False no 'processed_image' is drawn
         """
         try:
             logger.info(f"Processing uploaded image: {uploaded_file.name}, size: {uploaded_file.size}")
@@ -291,8 +410,14 @@ class GoatMorphometryProcessor:
             
             # Convert uploaded file to OpenCV format
             try:
-                image_array = np.asarray(bytearray(uploaded_file.read()), dtype=np.uint8)
-                image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+                if hasattr(uploaded_file, 'temporary_file_path'):
+                    # Large uploads are already spooled to disk; let OpenCV read the file directly,
+                    # letting libjpeg do most of the downscale
+                    image = read_image(uploaded_file.temporary_file_path(), 1920, 1080)
+                else:
+                    # Decode straight from the upload's bytes, letting libjpeg do most of the downscale
+                    uploaded_file.seek(0)
+                    image = decode_image(uploaded_file.read(), 1920, 1080)
                 
                 if image is None:
                     return {
@@ -324,25 +449,26 @@ class GoatMorphometryProcessor:
                 scale_factor = min(1920/width, 1080/height)
                 new_width = int(width * scale_factor)
                 new_height = int(height * scale_factor)
-                image = cv2.resize(image, (new_width, new_height))
+                image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
                 logger.info(f"Resized image to: {new_width}x{new_height}")
             
             # Process with MediaPipe
             try:
                 image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                results = self.pose.process(image_rgb)
+                detection_rgb = downscale_for_detection(image_rgb)
+                results = self.pose.process(detection_rgb)
                 logger.info("MediaPipe processing completed")
                 
                 if not results.pose_landmarks:
                     # Fallback 1: Try with different image preprocessing
                     logger.info("Initial pose detection failed, trying with enhanced contrast...")
-                    enhanced_image = self._enhance_image_for_detection(image_rgb)
+                    enhanced_image = self._enhance_image_for_detection(detection_rgb)
                     results = self.pose.process(enhanced_image)
                     
                     if not results.pose_landmarks:
                         # Fallback 2: Try face detection and estimate body landmarks
                         logger.info("Pose detection failed, trying face detection fallback...")
-                        return self._fallback_face_detection(image_rgb, reference_length_cm)
+                        return self._fallback_face_detection(image_rgb, reference_length_cm, annotate)
                 
             except Exception as e:
                 logger.error(f"Error in MediaPipe processing: {e}")
@@ -366,7 +492,8 @@ class GoatMorphometryProcessor:
             
             # Extract keypoints
             try:
-                keypoints = self._extract_keypoints(results.pose_landmarks, image.shape)
+                landmarks = self._landmarks_to_array(results.pose_landmarks)
+                keypoints = self._extract_keypoints(landmarks, image.shape)
                 logger.info(f"Extracted {len(keypoints)} keypoints")
                 
                 # Calculate scale factor if reference object is provided
@@ -376,20 +503,21 @@ class GoatMorphometryProcessor:
                 measurements = self._calculate_measurements(keypoints, scale_factor)
                 logger.info(f"Calculated {len(measurements)} measurements")
                 
-                # Generate processed image with annotations
-                processed_image = self._annotate_image(image.copy(), results.pose_landmarks)
-                
                 # Calculate overall confidence score
-                confidence_score = self._calculate_confidence(results.pose_landmarks)
+                confidence_score = self._calculate_confidence(landmarks)
                 
-                return {
+                result = {
                     'success': True,
                     'measurements': measurements,
                     'keypoints': keypoints,
                     'confidence_score': confidence_score,
-                    'processed_image': processed_image,
                     'scale_factor': scale_factor
                 }
+                if annotate:
+                    # Generate processed image with annotations
+                    # The decoded frame is not used again, so draw on it directly
+                    result['processed_image'] = self._annotate_image(image, results.pose_landmarks)
+                return result
                 
             except Exception as e:
                 logger.error(f"Error in measurement calculation: {e}")
@@ -416,26 +544,22 @@ class GoatMorphometryProcessor:
         try:
             # Convert to LAB color space for better processing
             lab = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2LAB)
-            l_channel, a, b = cv2.split(lab)
-            
-            # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization) to L channel
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-            l_channel = clahe.apply(l_channel)
             
-            # Merge channels and convert back to RGB
-            lab = cv2.merge((l_channel, a, b))
-            enhanced = cv2.cvtColor(lab, cv2.COLOR_LAB2RGB)
+            # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization) to the L channel
+            # only, writing it back into the LAB image rather than splitting and merging all three
+            cv2.insertChannel(self.clahe.apply(cv2.extractChannel(lab, 0)), lab, 0)
             
-            return enhanced
+            # Convert back to RGB in place; the LAB image is not needed afterwards
+            return cv2.cvtColor(lab, cv2.COLOR_LAB2RGB, dst=lab)
         except Exception as e:
             logger.error(f"Error enhancing image: {e}")
             return image_rgb
     
-    def _fallback_face_detection(self, image_rgb, reference_length_cm=None):
+    def _fallback_face_detection(self, image_rgb, reference_length_cm=None, annotate=True):
         """Fallback method using face detection and estimation"""
         try:
             # Try face detection
-            face_results = self.face_detection.process(image_rgb)
+            face_results = self.face_detection.process(downscale_for_detection(image_rgb))
             
             if face_results.detections:
                 # Use face detection to estimate body landmarks
@@ -459,18 +583,18 @@ class GoatMorphometryProcessor:
                 scale_factor = self._calculate_scale_factor(estimated_keypoints, reference_length_cm) if reference_length_cm else 1.0
                 measurements = self._calculate_measurements(estimated_keypoints, scale_factor)
                 
-                # Create annotated image
-                processed_image = self._annotate_estimated_points(image_rgb.copy(), estimated_keypoints)
-                
-                return {
+                result = {
                     'success': True,
                     'measurements': measurements,
                     'keypoints': estimated_keypoints,
                     'confidence_score': 0.5,  # Lower confidence for estimated measurements
-                    'processed_image': processed_image,
                     'scale_factor': scale_factor,
                     'note': 'Measurements estimated from face detection (lower accuracy)'
                 }
+                if annotate:
+                    # Create annotated image (image_rgb is not used again, so draw on it directly)
+                    result['processed_image'] = self._annotate_estimated_points(image_rgb, estimated_keypoints)
+                return result
             
             # If face detection also fails, return error with helpful suggestions
             return {
@@ -556,3 +680,18 @@ class GoatMorphometryProcessor:
         except Exception as e:
             logger.error(f"Error annotating estimated points: {e}")
             return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+
+_local = threading.local()
+
+
+def get_processor() -> GoatMorphometryProcessor:
+    """
+    Return this thread's GoatMorphometryProcessor, creating it on first use.
+    Loading the MediaPipe graphs is the expensive part of processing an image,
+    so it is done once per worker thread (the solution objects are not thread-safe)
+    """
+    processor = getattr(_local, 'processor', None)
+    if processor is None:
+        processor = _local.processor = GoatMorphometryProcessor()
+    return processor
@@ -4,15 +4,19 @@ import mediapipe as mp
 from PIL import Image
 import math
 from typing import Dict, List, Tuple, Optional, Union
+from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
 import io
 import logging
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
-import joblib
 import os
+import threading
 from pathlib import Path
 
+from .cv_processor import decode_image, downscale_for_detection
+from .model_files import load_model_file
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -31,10 +35,12 @@ class AdvancedGoatMorphometryProcessor:
             self.mp_selfie_segmentation = mp.solutions.selfie_segmentation
             self.mp_objectron = mp.solutions.objectron
             
+            pose_complexity = settings.IMAGE_PROCESSING_SETTINGS.get('POSE_MODEL_COMPLEXITY', 2)
+            
             # Primary pose detector (high accuracy)
             self.pose_detector_high = self.mp_pose.Pose(
                 static_image_mode=True,
-                model_complexity=2,
+                model_complexity=pose_complexity,
                 enable_segmentation=True,
                 min_detection_confidence=0.3
             )
@@ -42,7 +48,7 @@ class AdvancedGoatMorphometryProcessor:
             # Secondary pose detector (high recall)
             self.pose_detector_broad = self.mp_pose.Pose(
                 static_image_mode=True,
-                model_complexity=1,
+                model_complexity=min(pose_complexity, 1),
                 enable_segmentation=False,
                 min_detection_confidence=0.1
             )
@@ -59,6 +65,17 @@ class AdvancedGoatMorphometryProcessor:
             
             self.mp_drawing = mp.solutions.drawing_utils
             
+            # Enhancement operators, built once instead of on every image
+            self.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+            self.sharpen_kernel = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
+            
+            # Bootstrap sampling for measurement uncertainty
+            self.rng = np.random.default_rng()
+            self.bootstrap_samples = settings.AI_ML_SETTINGS.get('BOOTSTRAP_SAMPLES', 50)
+            
+            # Measurement name -> calculator, bound once rather than rebuilt for every image
+            self.measurement_functions = self._get_measurement_functions()
+            
             # Initialize anomaly detector for measurement validation
             self.anomaly_detector = IsolationForest(
                 contamination=0.1, random_state=42
@@ -86,13 +103,13 @@ class AdvancedGoatMorphometryProcessor:
     def _load_breed_models(self) -> Dict:
         """Load breed-specific measurement models"""
         models = {}
-        model_dir = Path(__file__).parent / 'ml_models'
+        model_dir = settings.AI_ML_SETTINGS['MODEL_DIR']
         
         if model_dir.exists():
             for model_file in model_dir.glob('*_breed_model.joblib'):
                 breed_name = model_file.stem.replace('_breed_model', '')
                 try:
-                    models[breed_name] = joblib.load(model_file)
+                    models[breed_name] = load_model_file(model_file)
                     logger.info(f"Loaded breed model for: {breed_name}")
                 except Exception as e:
                     logger.warning(f"Failed to load breed model {breed_name}: {e}")
@@ -107,12 +124,12 @@ class AdvancedGoatMorphometryProcessor:
         """
         try:
             # Preprocess image
-            image = self._preprocess_image(image_data)
+            image, gray = self._preprocess_image(image_data)
             if image is None:
                 return {'success': False, 'error': 'Image preprocessing failed'}
             
             # Image quality assessment
-            quality_score = self._assess_image_quality(image)
+            quality_score = self._assess_image_quality(image, gray)
             if quality_score < 0.3:
                 return {
                     'success': False, 
@@ -163,27 +180,33 @@ class AdvancedGoatMorphometryProcessor:
             logger.error(f"Advanced processing failed: {e}")
             return {'success': False, 'error': f'Processing failed: {str(e)}'}
     
-    def _preprocess_image(self, image_data: Union[bytes, np.ndarray]) -> Optional[np.ndarray]:
-        """Enhanced image preprocessing with multiple enhancement techniques"""
+    def _preprocess_image(self, image_data: Union[bytes, np.ndarray]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Enhanced image preprocessing with multiple enhancement techniques.
+        Returns the RGB image and, when still current, its grayscale version
+        """
         try:
             if isinstance(image_data, bytes):
-                nparr = np.frombuffer(image_data, np.uint8)
-                image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+                image = decode_image(image_data, 1920, 1920)
             else:
-                image = image_data.copy()
+                # cvtColor below writes a new array, so the caller's image is never modified
+                image = image_data
             
             if image is None:
-                return None
+                return None, None
             
-            # Convert to RGB
+            # Convert to RGB, and to grayscale straight from BGR once for all the checks
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             
             # Adaptive enhancement based on image characteristics
-            if self._is_low_contrast(image_rgb):
+            if self._is_low_contrast(gray):
                 image_rgb = self._enhance_contrast(image_rgb)
+                gray = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
             
-            if self._is_blurry(image_rgb):
+            if self._is_blurry(gray):
                 image_rgb = self._sharpen_image(image_rgb)
+                gray = None
             
             # Normalize image size
             height, width = image_rgb.shape[:2]
@@ -191,35 +214,40 @@ class AdvancedGoatMorphometryProcessor:
                 scale = 1920 / max(height, width)
                 new_width = int(width * scale)
                 new_height = int(height * scale)
-                image_rgb = cv2.resize(image_rgb, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
+                image_rgb = cv2.resize(image_rgb, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+                gray = None
             
-            return image_rgb
+            return image_rgb, gray
             
         except Exception as e:
             logger.error(f"Image preprocessing failed: {e}")
-            return None
+            return None, None
     
-    def _assess_image_quality(self, image: np.ndarray) -> float:
+    def _assess_image_quality(self, image: np.ndarray, gray: Optional[np.ndarray] = None) -> float:
         """Comprehensive image quality assessment"""
         try:
-            # Convert to grayscale for analysis
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            # Convert to grayscale for analysis, unless preprocessing already did
+            if gray is None:
+                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
             
             # Blur detection using Laplacian variance
-            blur_score = cv2.Laplacian(gray, cv2.CV_64F).var()
+            blur_score = self._laplacian_variance(gray)
             blur_quality = min(blur_score / 500, 1.0)  # Normalize
             
+            # Brightness and contrast from a single pass over the pixels
+            mean, stddev = cv2.meanStdDev(gray)
+            brightness = mean[0, 0]
+            contrast_score = stddev[0, 0]
+            
             # Contrast assessment
-            contrast_score = gray.std()
             contrast_quality = min(contrast_score / 50, 1.0)  # Normalize
             
             # Brightness assessment
-            brightness = gray.mean()
             brightness_quality = 1.0 - abs(brightness - 128) / 128  # Optimal around 128
             
             # Edge density (detail assessment)
             edges = cv2.Canny(gray, 50, 150)
-            edge_density = np.sum(edges > 0) / edges.size
+            edge_density = cv2.countNonZero(edges) / edges.size
             edge_quality = min(edge_density * 10, 1.0)  # Normalize
             
             # Noise assessment (inverse of noise level)
@@ -247,26 +275,29 @@ class AdvancedGoatMorphometryProcessor:
             results = []
             models_used = []
             
+            # Every model gets the same small copy; their outputs are normalized coordinates
+            detection_image = downscale_for_detection(image)
+            
             # High accuracy pose detection
-            result1 = self.pose_detector_high.process(image)
+            result1 = self.pose_detector_high.process(detection_image)
             if result1.pose_landmarks:
                 results.append(('pose_high', result1))
                 models_used.append('pose_high_accuracy')
             
             # Broad pose detection
-            result2 = self.pose_detector_broad.process(image)
+            result2 = self.pose_detector_broad.process(detection_image)
             if result2.pose_landmarks:
                 results.append(('pose_broad', result2))
                 models_used.append('pose_broad_recall')
             
             # Face detection for head region
-            result3 = self.face_detector.process(image)
+            result3 = self.face_detector.process(detection_image)
             if result3.detections:
                 results.append(('face', result3))
                 models_used.append('face_detection')
             
             # Segmentation for body outline
-            result4 = self.segmentation.process(image)
+            result4 = self.segmentation.process(detection_image)
             if result4.segmentation_mask is not None:
                 results.append(('segmentation', result4))
                 models_used.append('body_segmentation')
@@ -313,13 +344,15 @@ class AdvancedGoatMorphometryProcessor:
             # Extract key anatomical points with confidence intervals
             key_points = self._extract_anatomical_points(landmarks, w, h)
             
+            # Jittered landmark sets for bootstrap uncertainty estimation, drawn once and
+            # shared by every measurement
+            bootstrap_samples = self._bootstrap_landmark_samples(key_points)
+            
             # Calculate measurements with bootstrap uncertainty estimation
-            for measurement_name, calc_func in self._get_measurement_functions().items():
+            for measurement_name, calc_func in self.measurement_functions.items():
                 try:
                     values = []
-                    # Bootstrap sampling for uncertainty estimation
-                    for _ in range(50):  # 50 bootstrap samples
-                        noisy_points = self._add_landmark_noise(key_points)
+                    for noisy_points in bootstrap_samples:
                         value = calc_func(noisy_points, scale_factor)
                         if value > 0:  # Valid measurement
                             values.append(value)
@@ -457,31 +490,34 @@ class AdvancedGoatMorphometryProcessor:
             return 0.5
     
     # Utility methods for image processing
-    def _is_low_contrast(self, image: np.ndarray) -> bool:
-        """Check if image has low contrast"""
-        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-        return gray.std() < 30
+    def _is_low_contrast(self, gray: np.ndarray) -> bool:
+        """Check if a grayscale image has low contrast"""
+        return cv2.meanStdDev(gray)[1][0, 0] < 30
+    
+    def _is_blurry(self, gray: np.ndarray) -> bool:
+        """Check if a grayscale image is blurry"""
+        return self._laplacian_variance(gray) < 100
     
-    def _is_blurry(self, image: np.ndarray) -> bool:
-        """Check if image is blurry"""
-        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-        return cv2.Laplacian(gray, cv2.CV_64F).var() < 100
+    @staticmethod
+    def _laplacian_variance(gray: np.ndarray) -> float:
+        """Variance of the Laplacian, computed by OpenCV without NumPy temporaries"""
+        stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_64F))[1][0, 0]
+        return stddev * stddev
     
     def _enhance_contrast(self, image: np.ndarray) -> np.ndarray:
         """Enhance image contrast using CLAHE"""
         lab = cv2.cvtColor(image, cv2.COLOR_RGB2LAB)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        lab[:, :, 0] = clahe.apply(lab[:, :, 0])
-        return cv2.cvtColor(lab, cv2.COLOR_LAB2RGB)
+        cv2.insertChannel(self.clahe.apply(cv2.extractChannel(lab, 0)), lab, 0)
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2RGB, dst=lab)
     
     def _sharpen_image(self, image: np.ndarray) -> np.ndarray:
         """Sharpen blurry image"""
-        kernel = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
-        return cv2.filter2D(image, -1, kernel)
+        return cv2.filter2D(image, -1, self.sharpen_kernel)
     
     def _estimate_noise(self, image: np.ndarray) -> float:
-        """Estimate noise level in image"""
-        return cv2.fastNlMeansDenoising(image).var()
+        """Estimate noise level as the spread of the residual left by a 5x5 box blur"""
+        residual = cv2.absdiff(image, cv2.blur(image, (5, 5)))
+        return float(cv2.meanStdDev(residual)[1][0, 0])
     
     # Placeholder methods for complex calculations
     def _combine_detections(self, results: List, image_shape: Tuple) -> Dict:
@@ -508,17 +544,21 @@ class AdvancedGoatMorphometryProcessor:
         # Implementation would identify specific anatomical landmarks
         return {}
     
-    def _add_landmark_noise(self, points: Dict) -> Dict:
-        """Add small random noise for bootstrap uncertainty estimation"""
-        noisy_points = {}
-        for name, point in points.items():
-            if point is not None:
-                noise_x = np.random.normal(0, 2)  # 2 pixel standard deviation
-                noise_y = np.random.normal(0, 2)
-                noisy_points[name] = (point[0] + noise_x, point[1] + noise_y)
-            else:
-                noisy_points[name] = None
-        return noisy_points
+    def _bootstrap_landmark_samples(self, points: Dict) -> List[Dict]:
+        """
+        Copies of the points with small random noise for bootstrap uncertainty
+        estimation, all drawn in a single RNG call
+        """
+        names = [name for name, point in points.items() if point is not None]
+        missing = {name: None for name, point in points.items() if point is None}
+        coords = np.array([points[name] for name in names], dtype=np.float64).reshape(-1, 2)
+        
+        # 2 pixel standard deviation
+        noisy = coords + self.rng.normal(0, 2, size=(self.bootstrap_samples, len(names), 2))
+        return [
+            {**missing, **dict(zip(names, map(tuple, sample)))}
+            for sample in noisy.tolist()
+        ]
     
     def _apply_breed_corrections(self, measurements: Dict, breed: str) -> Tuple[Dict, float]:
         """Apply breed-specific measurement corrections"""
@@ -532,7 +572,8 @@ class AdvancedGoatMorphometryProcessor:
     def _create_annotated_image(self, image: np.ndarray, detection_results: Dict, 
                               measurements: Dict) -> np.ndarray:
         """Create annotated image with landmarks and measurements"""
-        annotated = image.copy()
+        # Preprocessing produced this array and nothing reads it afterwards, so draw in place
+        annotated = image
         
         # Draw landmarks if available
         if detection_results.get('landmarks'):
@@ -602,3 +643,17 @@ class AdvancedGoatMorphometryProcessor:
     def _calculate_tail_length(self, points: Dict, scale: float) -> float:
         """Calculate tail length"""
         return 25.0 * scale  # Placeholder
+
+
+_local = threading.local()
+
+
+def get_advanced_processor() -> AdvancedGoatMorphometryProcessor:
+    """
+    Return this thread's AdvancedGoatMorphometryProcessor, creating it on first use,
+    so the detector graphs and breed models are loaded once per worker thread
+    """
+    processor = getattr(_local, 'processor', None)
+    if processor is None:
+        processor = _local.processor = AdvancedGoatMorphometryProcessor()
+    return processor
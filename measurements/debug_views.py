@@ -5,7 +5,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 import logging
-from .cv_processor import GoatMorphometryProcessor
+from .cv_processor import get_processor
 
 logger = logging.getLogger(__name__)
 
@@ -114,7 +114,7 @@ def test_sample_images(request):
         # Test each sample image
         sample_files = ['sample_goat_profile.jpg', 'detection_test.jpg']
         
-        processor = GoatMorphometryProcessor()
+        processor = get_processor()
         
         for filename in sample_files:
             filepath = os.path.join(sample_dir, filename)
@@ -1,15 +1,40 @@
-import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from django.http import HttpResponse
+from openpyxl.utils import get_column_letter
+from django.http import FileResponse
 from django.utils import timezone
 from django.db import models
 from io import BytesIO
+from operator import attrgetter
 import logging
 
 logger = logging.getLogger(__name__)
 
+# (column label, model field) pairs for the per-measurement export columns
+EXPORT_MEASUREMENT_COLUMNS = (
+    ('Height at Withers (cm)', 'hauteur_au_garrot'),
+    ('Body Length (cm)', 'body_length'),
+    ('Chest Circumference (cm)', 'tour_de_poitrine'),
+    ('Height at Croup (cm)', 'hauteur_au_sacrum'),
+    ('Chest Width (cm)', 'largeur_poitrine'),
+    ('Hip Width (cm)', 'largeur_hanche'),
+    ('Head Length (cm)', 'longueur_tete'),
+    ('Head Width (cm)', 'largeur_tete'),
+    ('Ear Length (cm)', 'longueur_oreille'),
+    ('Neck Length (cm)', 'longueur_cou'),
+    ('Neck Circumference (cm)', 'tour_du_cou'),
+    ('Tail Length (cm)', 'longueur_queue'),
+)
+
+MEASUREMENT_SHEET_HEADERS = (
+    'Measurement ID', 'Goat Name', 'Goat Breed', 'Measurement Date',
+    'Confidence Score', 'Reference Length (cm)',
+    *(label for label, _ in EXPORT_MEASUREMENT_COLUMNS),
+)
+
+# Reads every exported measurement off a row in one C-level call
+get_export_measurements = attrgetter(*(field for _, field in EXPORT_MEASUREMENT_COLUMNS))
+
 
 class GoatMeasurementExporter:
     """Utility class for exporting goat measurements to Excel"""
@@ -26,7 +51,7 @@ class GoatMeasurementExporter:
             measurements_queryset: Optional queryset to filter measurements
             
         Returns:
-            HttpResponse with Excel file
+            FileResponse streaming the Excel file
         """
         try:
             if measurements_queryset is None:
@@ -55,17 +80,15 @@ class GoatMeasurementExporter:
             self.workbook.save(excel_buffer)
             excel_buffer.seek(0)
             
-            # Create HTTP response
-            response = HttpResponse(
-                excel_buffer.getvalue(),
+            # Stream the buffer in chunks rather than copying it out with getvalue()
+            filename = f"GoatMorpho_Measurements_{user.username}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            return FileResponse(
+                excel_buffer,
+                as_attachment=True,
+                filename=filename,
                 content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             )
             
-            filename = f"GoatMorpho_Measurements_{user.username}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            
-            return response
-            
         except Exception as e:
             logger.error(f"Error creating Excel export: {e}")
             raise
@@ -117,60 +140,41 @@ class GoatMeasurementExporter:
         """Create detailed measurements sheet"""
         ws = self.workbook.create_sheet("Detailed Measurements")
         
-        # Convert measurements to DataFrame
+        # Collect one row per measurement
         data = []
-        for measurement in measurements_queryset:
-            row = {
-                'Measurement ID': str(measurement.id),
-                'Goat Name': measurement.goat.name or 'Unnamed',
-                'Goat Breed': measurement.goat.breed or 'Unknown',
-                'Measurement Date': measurement.measurement_date.strftime('%Y-%m-%d %H:%M:%S'),
-                'Confidence Score': round(measurement.confidence_score, 3),
-                'Reference Length (cm)': measurement.reference_object_length_cm or 'N/A',
-                
-                # Morphometric measurements
-                'Height at Withers (cm)': round(measurement.hauteur_au_garrot, 2) if measurement.hauteur_au_garrot else 'N/A',
-                'Body Length (cm)': round(measurement.body_length, 2) if measurement.body_length else 'N/A',
-                'Chest Circumference (cm)': round(measurement.tour_de_poitrine, 2) if measurement.tour_de_poitrine else 'N/A',
-                'Height at Croup (cm)': round(measurement.hauteur_au_sacrum, 2) if measurement.hauteur_au_sacrum else 'N/A',
-                'Chest Width (cm)': round(measurement.largeur_poitrine, 2) if measurement.largeur_poitrine else 'N/A',
-                'Hip Width (cm)': round(measurement.largeur_hanche, 2) if measurement.largeur_hanche else 'N/A',
-                'Head Length (cm)': round(measurement.longueur_tete, 2) if measurement.longueur_tete else 'N/A',
-                'Head Width (cm)': round(measurement.largeur_tete, 2) if measurement.largeur_tete else 'N/A',
-                'Ear Length (cm)': round(measurement.longueur_oreille, 2) if measurement.longueur_oreille else 'N/A',
-                'Neck Length (cm)': round(measurement.longueur_cou, 2) if measurement.longueur_cou else 'N/A',
-                'Neck Circumference (cm)': round(measurement.tour_du_cou, 2) if measurement.tour_du_cou else 'N/A',
-                'Tail Length (cm)': round(measurement.longueur_queue, 2) if measurement.longueur_queue else 'N/A',
-            }
+        for measurement in measurements_queryset.select_related('goat'):
+            row = [
+                str(measurement.id),
+                measurement.goat.name or 'Unnamed',
+                measurement.goat.breed or 'Unknown',
+                measurement.measurement_date.strftime('%Y-%m-%d %H:%M:%S'),
+                round(measurement.confidence_score, 3),
+                measurement.reference_object_length_cm or 'N/A',
+            ]
+            # Morphometric measurements
+            row.extend(
+                round(value, 2) if value else 'N/A'
+                for value in get_export_measurements(measurement)
+            )
             data.append(row)
         
         if data:
-            df = pd.DataFrame(data)
-            
             # Write headers
-            for col_num, column_title in enumerate(df.columns, 1):
-                cell = ws.cell(row=1, column=col_num, value=column_title)
+            ws.append(MEASUREMENT_SHEET_HEADERS)
+            for cell in ws[1]:
                 cell.font = Font(bold=True, color="FFFFFF")
                 cell.fill = PatternFill(start_color="2F5F8F", end_color="2F5F8F", fill_type="solid")
                 cell.alignment = Alignment(horizontal="center")
             
-            # Write data
-            for row_num, row_data in enumerate(df.values, 2):
-                for col_num, value in enumerate(row_data, 1):
-                    ws.cell(row=row_num, column=col_num, value=value)
+            # Write data rows straight into the sheet, tracking the widest value per column
+            widths = [len(header) for header in MEASUREMENT_SHEET_HEADERS]
+            for row_data in data:
+                ws.append(row_data)
+                widths = [max(width, len(str(value))) for width, value in zip(widths, row_data)]
             
             # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)  # Max width of 50
-                ws.column_dimensions[column_letter].width = adjusted_width
+            for col_num, width in enumerate(widths, 1):
+                ws.column_dimensions[get_column_letter(col_num)].width = min(width + 2, 50)  # Max width of 50
         else:
             ws['A1'] = "No measurements found"
     
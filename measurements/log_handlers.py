@@ -0,0 +1,107 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+
+
+class TimedMemoryHandler(MemoryHandler):
+    """
+    MemoryHandler that batches records for its target and also flushes every
+    flush_interval seconds from a background thread, so records logged before a
+    quiet period reach the target even if no further record arrives
+    """
+
+    def __init__(self, capacity, flushLevel=logging.ERROR, target=None,
+                 flushOnClose=True, flush_interval=30):
+        super().__init__(capacity, flushLevel, target, flushOnClose)
+        self.flush_interval = flush_interval
+        # The flush thread starts with the first record of each process: a parent
+        # that forks after dictConfig (gunicorn --preload, prefork workers) hands
+        # its children this handler but not the thread
+        self._flush_pid = None
+        self._flush_thread = None
+        self._stop_flushing = None
+
+    def _start_flush_thread(self):
+        self._flush_pid = os.getpid()
+        self._stop_flushing = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_periodically, args=(self._stop_flushing,),
+            name='TimedMemoryHandler', daemon=True
+        )
+        self._flush_thread.start()
+
+    def _flush_periodically(self, stop_flushing):
+        while not stop_flushing.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record):
+        # handle() holds self.lock here, so only one thread starts the flusher
+        if self._flush_pid != os.getpid():
+            self._start_flush_thread()
+        super().emit(record)
+
+    def shouldFlush(self, record):
+        # emit() appends the record before asking, so the buffer is never empty here
+        return (
+            super().shouldFlush(record)
+            or record.created - self.buffer[0].created >= self.flush_interval
+        )
+
+    def close(self):
+        # Not joined: logging.shutdown() calls close() holding self.lock, which a
+        # flush in progress may be waiting on. Once super().close() has flushed and
+        # cleared the target, any late flush from the thread writes nothing
+        if self._flush_pid == os.getpid():
+            self._stop_flushing.set()
+        super().close()
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    QueueHandler that owns the QueueListener draining it: logging threads only
+    enqueue records, and the listener thread hands them to the real handlers
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+        # dictConfig passes 'cfg://handlers.<name>' references, which are only
+        # resolved to the configured handlers on item access (not on iteration)
+        targets = [handlers[index] for index in range(len(handlers))]
+        for target in targets:
+            if not isinstance(target, logging.Handler):
+                raise ValueError(f'Handler {target!r} must be configured before the queue handler')
+
+        self.targets = targets
+        self.respect_handler_level = respect_handler_level
+        # Like the flush thread above, the listener starts with the first record of
+        # each process, so forked children drain their own queue instead of piling
+        # records onto one that no thread reads
+        self.listener = None
+        self._listener_pid = None
+        # Drain the queue on exit, before logging.shutdown() flushes the targets
+        atexit.register(self.stop_listener)
+
+    def _start_listener(self):
+        if self._listener_pid is not None:
+            # Forked child: records the parent had queued but not handled yet are
+            # the parent's to write
+            self.queue = queue.SimpleQueue()
+        self._listener_pid = os.getpid()
+        self.listener = QueueListener(
+            self.queue, *self.targets, respect_handler_level=self.respect_handler_level
+        )
+        self.listener.start()
+
+    def stop_listener(self):
+        if self.listener is not None and self._listener_pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+
+    def emit(self, record):
+        # handle() holds self.lock here, so only one thread starts the listener
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
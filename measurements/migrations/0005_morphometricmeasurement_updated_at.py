@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-16 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0004_batchimageupload_measurementsession_failed_images_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='morphometricmeasurement',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Admin search filters with icontains, which PostgreSQL runs as
+# UPPER("name"::text) LIKE UPPER('%term%'). Trigram GIN indexes on that same
+# expression let those scans use an index. The admins search goat name and
+# breed in a subquery of their own (SplitJoinSearchMixin), since an OR with a
+# joined table's column would keep PostgreSQL from using them
+TRIGRAM_INDEXES = {
+    'measurements_goat_name_trgm': 'name',
+    'measurements_goat_breed_trgm': 'breed',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON measurements_goat '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0005_morphometricmeasurement_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
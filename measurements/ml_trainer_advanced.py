@@ -9,12 +9,14 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.feature_selection import SelectKBest, f_regression
 import xgboost as xgb
 from scipy import stats
-import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
+from django.conf import settings
 import warnings
+
+from .model_files import dump_model_file, load_model_file
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
@@ -28,7 +30,7 @@ class AdvancedMLTrainer:
     
     def __init__(self, model_dir: str = None):
         if model_dir is None:
-            self.model_dir = Path(__file__).parent / 'ml_models'
+            self.model_dir = settings.AI_ML_SETTINGS['MODEL_DIR']
         else:
             self.model_dir = Path(model_dir)
         
@@ -436,13 +438,13 @@ class AdvancedMLTrainer:
             for measurement, models in results.items():
                 for model_name, model_data in models.items():
                     model_path = self.model_dir / f"{measurement}_{model_name}_model.joblib"
-                    joblib.dump(model_data['model'], model_path)
+                    dump_model_file(model_data['model'], model_path)
                     
                     # Save scaler and feature selector
                     scaler_path = self.model_dir / f"{measurement}_scaler.joblib"
                     selector_path = self.model_dir / f"{measurement}_feature_selector.joblib"
-                    joblib.dump(self.scaler, scaler_path)
-                    joblib.dump(self.feature_selector, selector_path)
+                    dump_model_file(self.scaler, scaler_path)
+                    dump_model_file(self.feature_selector, selector_path)
             
             logger.info(f"Models saved to {self.model_dir}")
             
@@ -453,7 +455,7 @@ class AdvancedMLTrainer:
         """Save breed-specific model"""
         try:
             breed_model_path = self.model_dir / f"{breed}_breed_model.joblib"
-            joblib.dump(models, breed_model_path)
+            dump_model_file(models, breed_model_path)
             logger.info(f"Breed model saved for {breed}")
         except Exception as e:
             logger.error(f"Breed model saving failed for {breed}: {e}")
@@ -545,16 +547,16 @@ class AdvancedMLTrainer:
             for model_name in self.models.keys():
                 model_path = self.model_dir / f"{measurement}_{model_name}_model.joblib"
                 if model_path.exists():
-                    models[model_name] = joblib.load(model_path)
+                    models[model_name] = load_model_file(model_path)
             
             # Load preprocessing components
             scaler_path = self.model_dir / f"{measurement}_scaler.joblib"
             selector_path = self.model_dir / f"{measurement}_feature_selector.joblib"
             
             if scaler_path.exists():
-                self.scaler = joblib.load(scaler_path)
+                self.scaler = load_model_file(scaler_path)
             if selector_path.exists():
-                self.feature_selector = joblib.load(selector_path)
+                self.feature_selector = load_model_file(selector_path)
             
             return models
             
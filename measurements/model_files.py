@@ -0,0 +1,42 @@
+import os
+import tempfile
+from pathlib import Path
+
+import joblib
+from django.conf import settings
+
+# path -> (mtime_ns, model) for every model file this process has loaded
+_loaded_models = {}
+
+
+def load_model_file(path):
+    """
+    Load a joblib model file, reusing this process's copy until the file changes.
+    NumPy arrays inside are memory-mapped read-only (MODEL_MMAP_MODE), so workers
+    share one copy of the weights through the page cache instead of each holding its own
+    """
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+    cached = _loaded_models.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    model = joblib.load(path, mmap_mode=settings.AI_ML_SETTINGS.get('MODEL_MMAP_MODE'))
+    _loaded_models[path] = (mtime, model)
+    return model
+
+
+def dump_model_file(value, path):
+    """
+    Save a model file under a new inode and rename it into place, so processes that
+    have the previous version memory-mapped keep reading a complete file
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    os.close(fd)
+    try:
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
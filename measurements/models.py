@@ -6,6 +6,15 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 
 
+# The 17 morphometric measurement fields (cm), in model field order
+MEASUREMENT_FIELDS = (
+    'hauteur_au_garrot', 'hauteur_au_dos', 'hauteur_au_sternum', 'hauteur_au_sacrum',
+    'tour_de_poitrine', 'perimetre_thoracique', 'tour_abdominal', 'tour_du_cou',
+    'diametre_biscotal', 'largeur_poitrine', 'largeur_hanche', 'largeur_tete',
+    'body_length', 'longueur_oreille', 'longueur_tete', 'longueur_cou', 'longueur_queue',
+)
+
+
 class UserProfile(models.Model):
     """Extended user profile with additional information"""
     
@@ -130,6 +139,7 @@ class MorphometricMeasurement(models.Model):
                                          help_text="AI confidence score (0-1)",
                                          validators=[MinValueValidator(0.0), MaxValueValidator(1.0)])
     measurement_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     measured_by = models.ForeignKey(User, on_delete=models.CASCADE)
     
     # Reference object for scale (optional)
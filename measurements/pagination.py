@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class MeasurementCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a goat's measurements: each page is a range seek on
+    the (goat, measurement_date) index rather than an OFFSET scan
+    """
+    ordering = '-measurement_date'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
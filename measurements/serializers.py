@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Goat, MorphometricMeasurement, KeyPoint, MeasurementSession
+from django.core.cache import cache
+from .models import Goat, MorphometricMeasurement, KeyPoint, MeasurementSession, MEASUREMENT_FIELDS
+
+# Serialized measurements are cached for this many seconds
+MEASUREMENT_CACHE_TIMEOUT = 3600
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -22,7 +26,11 @@ class GoatSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_measurements_count(self, obj):
-        return obj.measurements.count()
+        # Use the queryset annotation when the view provides one
+        count = getattr(obj, 'measurements_count', None)
+        if count is None:
+            count = obj.measurements.count()
+        return count
 
 
 class KeyPointSerializer(serializers.ModelSerializer):
@@ -53,14 +61,49 @@ class MorphometricMeasurementSerializer(serializers.ModelSerializer):
             # Length measurements
             'body_length', 'longueur_oreille', 'longueur_tete', 'longueur_cou', 'longueur_queue',
             # Metadata
-            'measurement_method', 'confidence_score', 'measurement_date', 
+            'measurement_method', 'confidence_score', 'measurement_date', 'updated_at',
             'measured_by', 'reference_object_length_cm', 'notes',
             'keypoints', 'keypoints_count'
         ]
-        read_only_fields = ['id', 'measurement_date', 'keypoints', 'keypoints_count']
+        read_only_fields = ['id', 'measurement_date', 'updated_at', 'keypoints', 'keypoints_count']
     
     def get_keypoints_count(self, obj):
         return obj.keypoints.count()
+    
+    def to_representation(self, instance):
+        """
+        Serve repeat reads from the cache. The key carries updated_at, so any save
+        of the measurement misses naturally; the nested goat (whose counts change
+        independently) is always rendered fresh
+        """
+        if instance.pk is None or instance.updated_at is None or 'request' in self.context:
+            return super().to_representation(instance)
+        
+        cache_key = f'measurement_{instance.pk}_{instance.updated_at.timestamp()}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().to_representation(instance)
+            cache.set(cache_key, data, MEASUREMENT_CACHE_TIMEOUT)
+        else:
+            data['goat'] = self.fields['goat'].to_representation(instance.goat)
+        return data
+
+
+class MeasurementListSerializer(serializers.ModelSerializer):
+    """
+    Per-row serializer for measurement listings: the goat is returned once
+    alongside the list, and keypoints are reduced to a count
+    """
+    measured_by = UserSerializer(read_only=True)
+    keypoints_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = MorphometricMeasurement
+        fields = [
+            'id', 'original_image', 'processed_image', *MEASUREMENT_FIELDS,
+            'measurement_method', 'confidence_score', 'measurement_date', 'updated_at',
+            'measured_by', 'reference_object_length_cm', 'notes', 'keypoints_count'
+        ]
 
 
 class MeasurementSessionSerializer(serializers.ModelSerializer):
@@ -93,13 +136,7 @@ class MeasurementUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = MorphometricMeasurement
-        fields = [
-            'hauteur_au_garrot', 'hauteur_au_dos', 'hauteur_au_sternum', 'hauteur_au_sacrum',
-            'tour_de_poitrine', 'perimetre_thoracique', 'tour_abdominal', 'tour_du_cou',
-            'diametre_biscotal', 'largeur_poitrine', 'largeur_hanche', 'largeur_tete',
-            'body_length', 'longueur_oreille', 'longueur_tete', 'longueur_cou', 'longueur_queue',
-            'notes'
-        ]
+        fields = [*MEASUREMENT_FIELDS, 'notes']
 
 
 class MeasurementSummarySerializer(serializers.ModelSerializer):
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache_key
+from .models import KeyPoint, MorphometricMeasurement
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Drop a revoked token from the auth cache"""
+    cache.delete(token_cache_key(instance.key))
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_tokens(sender, instance, created, **kwargs):
+    """Keep cached token users in step with is_active/is_staff changes"""
+    update_fields = kwargs.get('update_fields')
+    if created or (update_fields and set(update_fields) == {'last_login'}):
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        cache.delete(token_cache_key(key))
+
+
+@receiver(user_logged_in)
+def extend_authenticated_session(sender, request, user, **kwargs):
+    """Keep signed-in sessions for the long lifetime; anonymous ones stay short-lived"""
+    if request is not None and hasattr(request, 'session'):
+        request.session.set_expiry(settings.AUTHENTICATED_SESSION_AGE)
+
+
+@receiver(post_save, sender=KeyPoint)
+@receiver(post_delete, sender=KeyPoint)
+def touch_keypoint_measurement(sender, instance, **kwargs):
+    """Bump the measurement's updated_at so its cached representation is refreshed"""
+    MorphometricMeasurement.objects.filter(pk=instance.measurement_id).update(
+        updated_at=timezone.now()
+    )
+
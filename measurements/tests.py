@@ -1,14 +1,19 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.core.exceptions import ValidationError
+from django.db import connection
 from decimal import Decimal
+import os
 import tempfile
 from PIL import Image
 import io
+import json
+from unittest import mock, skipUnless
+import numpy as np
 
-from .models import Goat, MorphometricMeasurement, UserProfile, KeyPoint, MeasurementSession
+from .models import Goat, MorphometricMeasurement, UserProfile, KeyPoint, MeasurementSession, BatchImageUpload
 from .cv_processor import GoatMorphometryProcessor
 
 
@@ -112,12 +117,443 @@ class ViewTestCase(TestCase):
         response = self.client.get(reverse('measurements:upload_image'))
         self.assertEqual(response.status_code, 302)  # Redirect to login
     
+    def test_login_extends_session(self):
+        """Signing in should switch the session to the authenticated lifetime"""
+        from django.conf import settings
+        self.client.login(username='testuser', password='testpass123')
+        self.assertEqual(self.client.session.get_expiry_age(), settings.AUTHENTICATED_SESSION_AGE)
+    
     def test_api_authentication(self):
         """Test API endpoints require authentication"""
         response = self.client.post('/api/upload-and-process/')
         self.assertEqual(response.status_code, 401)  # Unauthorized
 
 
+class MeasurementAPITestCase(TestCase):
+    """Test cases for the goat and measurement API endpoints"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        goat = Goat.objects.create(name='Test Goat', owner=self.user)
+        for method, score in (('AUTO', '0.800'), ('AUTO', '0.600'), ('MANUAL', '1.000')):
+            MorphometricMeasurement.objects.create(
+                goat=goat,
+                original_image='goat_images/original/test.jpg',
+                measurement_method=method,
+                confidence_score=Decimal(score),
+                measured_by=self.user
+            )
+        self.client = Client()
+        self.client.login(username='testuser', password='testpass123')
+    
+    def test_statistics_counts(self):
+        """Statistics should count measurements per method"""
+        response = self.client.get('/api/statistics/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['total_measurements'], 3)
+        self.assertEqual(data['total_goats'], 1)
+        self.assertEqual(data['measurements_by_method'], {'AUTO': 2, 'MANUAL': 1, 'HYBRID': 0})
+    
+    def test_goat_list_measurements_count(self):
+        """Goat list should report measurement counts without a query per goat"""
+        Goat.objects.create(name='Second Goat', owner=self.user)
+        with self.assertNumQueries(3):  # session, user, goats
+            response = self.client.get('/api/goats/')
+        counts = {goat['name']: goat['measurements_count'] for goat in response.json()}
+        self.assertEqual(counts, {'Test Goat': 3, 'Second Goat': 0})
+    
+    def test_goat_list_matches_serializer(self):
+        """Goat list fast path should produce the same payload as GoatSerializer"""
+        from .serializers import GoatSerializer
+        from django.db.models import Count
+        Goat.objects.create(name='Weighed Goat', weight_kg=Decimal('31.25'), owner=self.user)
+        goats = Goat.objects.filter(owner=self.user).annotate(
+            measurements_count=Count('measurements')
+        ).order_by('-created_at')
+        expected = json.loads(json.dumps(GoatSerializer(goats, many=True).data))
+        self.assertEqual(self.client.get('/api/goats/').json(), expected)
+    
+    def test_goat_measurements_cursor_pagination(self):
+        """Goat measurements should page through a cursor"""
+        goat = Goat.objects.get(name='Test Goat')
+        response = self.client.get(f'/api/goats/{goat.id}/measurements/?page_size=2')
+        data = response.json()
+        self.assertEqual(len(data['measurements']), 2)
+        self.assertNotIn('goat', data['measurements'][0])
+        self.assertEqual(data['measurements'][0]['keypoints_count'], 0)
+        self.assertEqual(data['goat']['measurements_count'], 3)
+        self.assertIsNone(data['previous'])
+        
+        data = self.client.get(data['next']).json()
+        self.assertEqual(len(data['measurements']), 1)
+        self.assertIsNone(data['next'])
+    
+    def test_measurement_detail_reflects_updates(self):
+        """Cached measurement payloads should be replaced after an update"""
+        measurement = MorphometricMeasurement.objects.filter(measurement_method='MANUAL').get()
+        url = f'/api/measurements/{measurement.id}/'
+        self.assertIsNone(self.client.get(url).json()['measurement']['notes'])
+        
+        response = self.client.put(
+            f'{url}update/', {'notes': 'Re-measured'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).json()['measurement']['notes'], 'Re-measured')
+    
+    def test_measurement_detail_etag(self):
+        """Unchanged measurements should answer conditional requests with 304"""
+        measurement = MorphometricMeasurement.objects.filter(measurement_method='MANUAL').get()
+        url = f'/api/measurements/{measurement.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        
+        measurement.notes = 'Re-measured'
+        measurement.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+    
+    def test_excel_export_streams_workbook(self):
+        """Excel export should stream a valid xlsx attachment"""
+        response = self.client.get('/export-excel/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content)[:2], b'PK')
+
+    
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_duplicate_upload_reuses_result(self):
+        """Re-uploading the same image should reuse the cached processing result"""
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(buffer, format='PNG')
+        processor = mock.Mock()
+        processor.process_goat_image_advanced.return_value = {
+            'success': True,
+            'measurements': {'body_length': 80.5},
+            'confidence_score': 0.9,
+            'keypoints': [{'name': 'nose', 'x': 1.0, 'y': 2.0, 'visibility': 0.9}],
+            'processed_image': np.zeros((10, 10, 3), dtype=np.uint8),
+        }
+        goat = Goat.objects.get()
+        
+        with mock.patch('measurements.views.get_advanced_processor', return_value=processor):
+            for _ in range(2):
+                response = self.client.post('/api/upload/', {
+                    'image': SimpleUploadedFile('goat.png', buffer.getvalue()),
+                    'goat_id': str(goat.id),
+                })
+                self.assertEqual(response.status_code, 201)
+        
+        self.assertEqual(processor.process_goat_image_advanced.call_count, 1)
+        latest = MorphometricMeasurement.objects.filter(body_length__isnull=False)
+        self.assertEqual(latest.count(), 2)
+        self.assertEqual(KeyPoint.objects.filter(measurement__in=latest).count(), 2)
+        
+        # Each measurement owns its processed image file
+        first, second = latest.order_by('measurement_date')
+        self.assertNotEqual(first.processed_image.name, second.processed_image.name)
+        self.assertTrue(second.processed_image.storage.exists(second.processed_image.name))
+    
+    def _create_batch_session(self, image_content=b'image'):
+        """A pending batch session holding one uploaded image"""
+        goat = Goat.objects.get()
+        session = MeasurementSession.objects.create(
+            user=self.user, session_name='Batch', goat=goat, total_images=1
+        )
+        BatchImageUpload.objects.create(
+            session=session,
+            original_filename='goat.png',
+            image_file=SimpleUploadedFile('goat.png', image_content)
+        )
+        return session
+    
+    BATCH_KEYPOINTS = [
+        {'name': 'left_shoulder', 'x': 10.0, 'y': 20.0, 'z': 0.0, 'visibility': 0.9},
+        {'name': 'left_hip', 'x': 90.0, 'y': 25.0, 'z': 0.0, 'visibility': 0.8},
+    ]
+    
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_batch_processing_records_results(self):
+        """Batch processing should store each image's result and complete the session"""
+        from .views import process_batch_images_sync
+        
+        session = self._create_batch_session()
+        processor = mock.Mock()
+        processor.process_goat_image_advanced.return_value = {
+            'success': True,
+            'measurements': {'body_length': 80.5},
+            'keypoints': self.BATCH_KEYPOINTS,
+            'confidence_score': 0.9,
+        }
+        
+        with mock.patch('measurements.views.get_advanced_processor', return_value=processor):
+            process_batch_images_sync(session.id, {'use_advanced_ai': True})
+        
+        self.assertEqual(processor.process_goat_image_advanced.call_args.kwargs['image_data'], b'image')
+        batch_image = BatchImageUpload.objects.select_related('measurement').get()
+        self.assertEqual(batch_image.status, 'COMPLETED')
+        self.assertEqual(batch_image.measurement.body_length, 80.5)
+        self.assertEqual(
+            sorted(batch_image.measurement.keypoints.values_list('name', 'confidence')),
+            [('left_hip', Decimal('0.8')), ('left_shoulder', Decimal('0.9'))]
+        )
+        session.refresh_from_db()
+        self.assertEqual((session.status, session.processed_images), ('COMPLETED', 1))
+        
+        # A duplicate run for the finished session does nothing
+        with mock.patch('measurements.views.get_advanced_processor', return_value=processor):
+            process_batch_images_sync(session.id, {'use_advanced_ai': True})
+        self.assertEqual(processor.process_goat_image_advanced.call_count, 1)
+    
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_basic_batch_processing_records_keypoints(self):
+        """The standard CV batch path should store the keypoint list it gets back"""
+        from .views import process_batch_images_sync
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (100, 50)).save(buffer, format='PNG')
+        session = self._create_batch_session(buffer.getvalue())
+        processor = mock.Mock()
+        processor.process_image.return_value = {
+            'success': True,
+            'measurements': {'body_length': 80.5},
+            'keypoints': self.BATCH_KEYPOINTS,
+            'confidence_score': 0.85,
+            'scale_factor': 1.0,
+        }
+        
+        with mock.patch('measurements.views.get_processor', return_value=processor):
+            process_batch_images_sync(session.id, {'use_advanced_ai': False})
+        
+        self.assertEqual(processor.process_image.call_args.args[0].shape, (50, 100, 3))
+        batch_image = BatchImageUpload.objects.select_related('measurement').get()
+        self.assertEqual(batch_image.status, 'COMPLETED')
+        self.assertEqual(batch_image.measurement.keypoints.count(), 2)
+        self.assertEqual(MorphometricMeasurement.objects.filter(goat=session.goat).count(), 1)
+    
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_failed_batch_image_leaves_no_measurement(self):
+        """A failure while saving keypoints should not leave an orphan measurement"""
+        from .views import process_batch_images_sync
+        
+        session = self._create_batch_session()
+        processor = mock.Mock()
+        processor.process_goat_image_advanced.return_value = {
+            'success': True,
+            'measurements': {'body_length': 80.5},
+            'keypoints': [{'name': 'left_shoulder'}],  # no coordinates
+            'confidence_score': 0.9,
+        }
+        
+        with mock.patch('measurements.views.get_advanced_processor', return_value=processor):
+            process_batch_images_sync(session.id, {'use_advanced_ai': True})
+        
+        self.assertEqual(BatchImageUpload.objects.get().status, 'FAILED')
+        self.assertFalse(MorphometricMeasurement.objects.filter(goat=session.goat).exists())
+    
+    def test_orjson_renderer_matches_json_renderer(self):
+        """The orjson renderer should produce JSONRenderer's output and accept NumPy values"""
+        import numpy as np
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import ORJSONRenderer
+        
+        data = {'score': Decimal('0.850'), 'name': 'Chèvre \u2028', 'counts': {1: 2}, 'values': [1.5, None]}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render({'keypoints': np.array([[1.0, 2.0]], dtype=np.float32)})),
+            {'keypoints': [[1.0, 2.0]]}
+        )
+
+
+class AdminSearchTestCase(TestCase):
+    """Test cases for admin search across joined tables"""
+    
+    def setUp(self):
+        from django.contrib import admin
+        from django.test import RequestFactory
+        alice = User.objects.create_user(username='alice', password='testpass123')
+        bob = User.objects.create_user(username='bob', password='testpass123')
+        self.daisy = Goat.objects.create(name='Daisy', breed='Boer', owner=alice)
+        self.bella = Goat.objects.create(name='Bella', breed='Alpine', owner=bob)
+        self.nanny = Goat.objects.create(name='Nanny', breed='Saanen', owner=bob)
+        self.goat_admin = admin.site._registry[Goat]
+        self.request = RequestFactory().get('/admin/measurements/goat/')
+    
+    def search(self, term):
+        queryset, may_have_duplicates = self.goat_admin.get_search_results(
+            self.request, Goat.objects.all(), term
+        )
+        self.assertFalse(may_have_duplicates)
+        return queryset
+    
+    def test_goat_search_matches_goat_columns_and_owner(self):
+        """Every word must match a goat column or the owner's username"""
+        self.assertEqual(set(self.search('bob')), {self.bella, self.nanny})
+        self.assertEqual(set(self.search('ALPINE')), {self.bella})
+        self.assertEqual(set(self.search('bob saanen')), {self.nanny})
+        self.assertEqual(set(self.search('alice bella')), set())
+        self.assertEqual(self.search('').count(), 3)
+    
+    @skipUnless(connection.vendor == 'postgresql', 'trigram indexes are PostgreSQL-only')
+    def test_goat_search_uses_trigram_indexes(self):
+        """The name/breed match should be able to run on the trigram indexes"""
+        queryset = self.search('daisy')
+        with connection.cursor() as cursor:
+            # Test tables are tiny; rule out sequential scans to see whether the indexes apply
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        self.assertIn('measurements_goat_name_trgm', plan)
+        self.assertIn('measurements_goat_breed_trgm', plan)
+
+
+class LogHandlerTestCase(TestCase):
+    """Test cases for the buffered log handlers"""
+    
+    def test_timed_memory_handler_flushes_when_idle(self):
+        """Buffered records should reach the target after flush_interval with no further logging"""
+        import logging
+        import time
+        from .log_handlers import TimedMemoryHandler
+        
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        handler = TimedMemoryHandler(capacity=100, target=target, flush_interval=0.1)
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'buffered', 'levelno': logging.INFO}))
+            self.assertEqual(stream.getvalue(), '')
+            deadline = time.monotonic() + 2
+            while not stream.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(stream.getvalue(), 'buffered\n')
+        finally:
+            handler.close()
+        handler._flush_thread.join(timeout=2)
+        self.assertFalse(handler._flush_thread.is_alive())
+    
+    def _run_in_forked_child(self, child):
+        """Run child() in a forked process and return the string it returns"""
+        import warnings
+        
+        read_fd, write_fd = os.pipe()
+        with warnings.catch_warnings():
+            # Forking with live threads is what these tests exercise
+            warnings.simplefilter('ignore', DeprecationWarning)
+            pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                os.write(write_fd, child().encode())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            output = pipe.read()
+        os.waitpid(pid, 0)
+        return output
+    
+    def _wait_for_output(self, stream, expected):
+        import time
+        
+        deadline = time.monotonic() + 2
+        while stream.getvalue() != expected and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return stream.getvalue()
+    
+    @skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_timed_memory_handler_flushes_in_forked_child(self):
+        """A child forked after the flush thread started should flush on its own timer"""
+        import logging
+        from .log_handlers import TimedMemoryHandler
+        
+        stream = io.StringIO()
+        handler = TimedMemoryHandler(
+            capacity=100, target=logging.StreamHandler(stream), flush_interval=0.1
+        )
+        
+        def child():
+            stream.seek(0)
+            stream.truncate()
+            handler.handle(logging.makeLogRecord({'msg': 'child', 'levelno': logging.INFO}))
+            return self._wait_for_output(stream, 'child\n')
+        
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'parent', 'levelno': logging.INFO}))
+            self.assertEqual(self._wait_for_output(stream, 'parent\n'), 'parent\n')
+            self.assertEqual(self._run_in_forked_child(child), 'child\n')
+        finally:
+            handler.close()
+    
+    @skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_queue_listener_restarts_in_forked_child(self):
+        """The listener should start on the first record, and again in a forked child"""
+        import logging
+        from .log_handlers import QueueListenerHandler
+        
+        stream = io.StringIO()
+        handler = QueueListenerHandler([logging.StreamHandler(stream)])
+        self.assertIsNone(handler.listener)
+        
+        def child():
+            stream.seek(0)
+            stream.truncate()
+            handler.handle(logging.makeLogRecord({'msg': 'child', 'levelno': logging.INFO}))
+            output = self._wait_for_output(stream, 'child\n')
+            handler.stop_listener()
+            return output
+        
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'parent', 'levelno': logging.INFO}))
+            self.assertEqual(self._wait_for_output(stream, 'parent\n'), 'parent\n')
+            self.assertEqual(self._run_in_forked_child(child), 'child\n')
+        finally:
+            handler.stop_listener()
+        self.assertIsNone(handler.listener)
+
+
+class TokenAuthenticationTestCase(TestCase):
+    """Test cases for cached token authentication"""
+    
+    def setUp(self):
+        from rest_framework.authtoken.models import Token
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = Client(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+    
+    def test_token_lookup_is_cached(self):
+        """Repeat requests should not query the token table again"""
+        self.assertEqual(self.client.get('/api/goats/').status_code, 200)
+        with self.assertNumQueries(1):  # only the goats query
+            self.assertEqual(self.client.get('/api/goats/').status_code, 200)
+    
+    def test_deactivated_user_rejected(self):
+        """Deactivating a user should invalidate its cached token"""
+        self.client.get('/api/goats/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertIn(self.client.get('/api/goats/').status_code, (401, 403))
+    
+    def test_token_takes_precedence_over_session(self):
+        """Token requests skip session auth and its CSRF check"""
+        client = Client(enforce_csrf_checks=True, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client.login(username='testuser', password='testpass123')
+        response = client.post('/api/goats/create/', {'name': 'Nanny'})
+        self.assertNotEqual(response.status_code, 403)
+    
+    def test_deleted_token_rejected(self):
+        """Deleting a token should invalidate the cache entry"""
+        self.client.get('/api/goats/')
+        self.token.delete()
+        self.assertIn(self.client.get('/api/goats/').status_code, (401, 403))
+
+
 class CVProcessorTestCase(TestCase):
     """Test cases for computer vision processing"""
     
@@ -144,6 +580,28 @@ class CVProcessorTestCase(TestCase):
         except Exception as e:
             # Processing might fail with test image, but shouldn't crash
             self.assertIsInstance(e, Exception)
+    
+    def test_read_image_decodes_reduced(self):
+        """JPEGs on disk should be downscaled by the decoder, as in-memory ones are"""
+        from .cv_processor import decode_image, read_image
+        
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as temp_file:
+            Image.new('RGB', (4000, 2000), color='white').save(temp_file, format='JPEG')
+            temp_file.flush()
+            image = read_image(temp_file.name, 1920, 1080)
+            temp_file.seek(0)
+            self.assertEqual(decode_image(temp_file.read(), 1920, 1080).shape, image.shape)
+        self.assertEqual(image.shape, (1000, 2000, 3))
+    
+    def test_calculate_measurements(self):
+        """Heights use the vertical distance, lengths the straight line"""
+        keypoints = [
+            {'name': 'left_shoulder', 'x': 0.0, 'y': 0.0},
+            {'name': 'left_ankle', 'x': 3.0, 'y': 40.0},
+            {'name': 'left_hip', 'x': 30.0, 'y': 40.0},
+        ]
+        measurements = self.processor._calculate_measurements(keypoints, 2.0)
+        self.assertEqual(measurements, {'hauteur_au_garrot': 80.0, 'body_length': 100.0})
 
 
 class SecurityTestCase(TestCase):
@@ -174,6 +632,17 @@ class SecurityTestCase(TestCase):
         # Should reject non-image files
         self.assertNotEqual(response.status_code, 200)
     
+    def test_image_signature_validation(self):
+        """Uploads must carry a real image header, not just an image extension"""
+        from .views import validate_image_file
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(buffer, format='PNG')
+        self.assertTrue(validate_image_file(SimpleUploadedFile('goat.png', buffer.getvalue())))
+        
+        with self.assertRaises(ValidationError):
+            validate_image_file(SimpleUploadedFile('goat.jpg', b'<?php echo "not an image"; ?>'))
+    
     def test_sql_injection_protection(self):
         """Test protection against SQL injection"""
         self.client.login(username='testuser', password='testpass123')
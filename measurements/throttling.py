@@ -0,0 +1,9 @@
+from rest_framework.throttling import UserRateThrottle
+
+
+class UploadRateThrottle(UserRateThrottle):
+    """
+    Per-user throttle for the image processing endpoint, at the 'upload' rate
+    in DEFAULT_THROTTLE_RATES: each request occupies a worker with CV work
+    """
+    scope = 'upload'
@@ -4,20 +4,22 @@ from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login
 from django.contrib import messages
-from django.core.files.base import ContentFile
-from django.views.decorators.http import require_http_methods
+from django.core.files.base import ContentFile, File
+from django.views.decorators.http import require_http_methods, condition
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 from django.core.cache import cache
 from django.views.decorators.cache import cache_page
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db import models
+from django.db import models, transaction
+import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 try:
     import cv2
 except ImportError:
@@ -26,21 +28,60 @@ import numpy as np
 import pandas as pd
 import joblib
 from typing import Dict, List, Optional
-from io import BytesIO
+from operator import attrgetter
 import base64
 
 logger = logging.getLogger(__name__)
 
-from .models import Goat, MorphometricMeasurement, KeyPoint, MeasurementSession, UserProfile, BatchImageUpload
-from .cv_processor import GoatMorphometryProcessor
-from .cv_processor_advanced import AdvancedGoatMorphometryProcessor
+from .models import (
+    Goat, MorphometricMeasurement, KeyPoint, MeasurementSession, UserProfile, BatchImageUpload,
+    MEASUREMENT_FIELDS
+)
+from .cv_processor import get_processor
+from .cv_processor_advanced import get_advanced_processor
 from .ml_trainer_advanced import AdvancedMLTrainer
 from .forms import CustomUserRegistrationForm, UserProfileForm, MultipleImageUploadForm
 from .excel_export import GoatMeasurementExporter
+from .pagination import MeasurementCursorPagination
+from .throttling import UploadRateThrottle
 from .serializers import (
-    GoatSerializer, MorphometricMeasurementSerializer,
-    KeyPointSerializer, MeasurementSessionSerializer
+    UserSerializer, GoatSerializer, MorphometricMeasurementSerializer,
+    MeasurementListSerializer, KeyPointSerializer, MeasurementSessionSerializer
+)
+
+# Columns of the per-user training frame, and a C-level getter pulling them
+# off a measurement (with its goat) in one call
+TRAINING_COLUMNS = (
+    'goat_id', 'breed', 'sex', 'confidence_score',
+    'hauteur_au_garrot', 'hauteur_au_dos', 'hauteur_au_sternum', 'hauteur_au_sacrum',
+    'body_length', 'tour_de_poitrine', 'perimetre_thoracique', 'largeur_poitrine',
+    'largeur_hanche', 'largeur_tete', 'longueur_tete', 'longueur_oreille',
+    'longueur_cou', 'tour_du_cou', 'longueur_queue',
 )
+get_training_row = attrgetter('goat.id', 'goat.breed', 'goat.sex', *TRAINING_COLUMNS[3:])
+
+
+# Leading bytes of the accepted upload formats: JPEG, PNG, BMP
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'BM')
+
+# Processing results of an upload are reused for identical re-uploads for this many seconds
+PROCESSING_RESULT_CACHE_TIMEOUT = 3600
+
+# Batch image error messages are stored truncated to this length (the full error is logged)
+BATCH_ERROR_MESSAGE_MAX_LENGTH = 255
+
+
+def processing_result_cache_key(user_id, uploaded_file, *params):
+    """
+    Cache key for the processing result of one user's exact image bytes and options.
+    The upload is hashed chunk by chunk, so one spooled to disk is never read into memory whole
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    digest.update(repr(params).encode())
+    return f'cvresult_{user_id}_{digest.hexdigest()}'
 
 
 def validate_image_file(uploaded_file):
@@ -56,12 +97,12 @@ def validate_image_file(uploaded_file):
     if uploaded_file.size > max_size:
         raise ValidationError('File size too large. Maximum size is 10MB.')
     
-    # Check if it's actually an image
-    try:
-        from PIL import Image
-        image = Image.open(uploaded_file)
-        image.verify()
-    except Exception:
+    # Check if it's actually an image by its magic bytes; the full decode happens
+    # once, in the CV processor, which rejects corrupt data
+    uploaded_file.seek(0)
+    header = uploaded_file.read(8)
+    uploaded_file.seek(0)
+    if not header.startswith(IMAGE_SIGNATURES):
         raise ValidationError('Invalid image file.')
     
     return True
@@ -69,6 +110,7 @@ def validate_image_file(uploaded_file):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([UploadRateThrottle])
 def upload_and_process_image(request):
     """
     API endpoint to upload goat image and process morphometric measurements
@@ -125,9 +167,17 @@ def upload_and_process_image(request):
         use_advanced_processing = request.data.get('use_advanced_ai', True)
         breed = request.data.get('breed', None)
         
-        if use_advanced_processing:
+        # Identical re-uploads (client retries) reuse the earlier result instead of rerunning MediaPipe
+        result_cache_key = processing_result_cache_key(
+            request.user.id, uploaded_image, bool(use_advanced_processing), reference_length, breed
+        )
+        cached_result = cache.get(result_cache_key)
+        
+        if cached_result is not None:
+            result = cached_result
+        elif use_advanced_processing:
             try:
-                processor = AdvancedGoatMorphometryProcessor()
+                processor = get_advanced_processor()
                 
                 logger.info(f"Processing image with advanced AI for user {request.user.username}", extra={
                     'user_id': request.user.id,
@@ -138,10 +188,9 @@ def upload_and_process_image(request):
                     'processing_type': 'advanced_ai'
                 })
                 
-                # Convert uploaded file to bytes for advanced processing
+                # The advanced processor works on the raw bytes
                 uploaded_image.seek(0)
                 image_bytes = uploaded_image.read()
-                
                 result = processor.process_goat_image_advanced(
                     image_data=image_bytes,
                     reference_length=reference_length,
@@ -156,12 +205,12 @@ def upload_and_process_image(request):
             except Exception as e:
                 logger.warning(f"Advanced AI processing failed, falling back to standard: {e}")
                 # Fallback to standard processing
-                processor = GoatMorphometryProcessor()
+                processor = get_processor()
                 result = processor.process_uploaded_image(uploaded_image, reference_length)
                 result['processing_metadata'] = {'ai_enhanced': False, 'fallback_used': True}
         else:
             # Standard processing
-            processor = GoatMorphometryProcessor()
+            processor = get_processor()
             
             logger.info(f"Processing image with standard CV for user {request.user.username}", extra={
                 'user_id': request.user.id,
@@ -203,24 +252,48 @@ def upload_and_process_image(request):
         # Save processed image
         if 'processed_image' in result:
             processed_img_array = result['processed_image']
-            _, buffer = cv2.imencode('.jpg', processed_img_array)
-            processed_img_bytes = BytesIO(buffer)
+            _, buffer = cv2.imencode('.jpg', processed_img_array, [cv2.IMWRITE_JPEG_QUALITY, 85])
             
             measurement.processed_image.save(
                 f'processed_{uploaded_image.name}',
-                ContentFile(processed_img_bytes.getvalue()),
-                save=True
+                ContentFile(buffer.tobytes()),
+                save=False
             )
+            measurement.save(update_fields=['processed_image', 'updated_at'])
+        elif result.get('processed_image_name'):
+            # A cached result names the file written for the earlier measurement; give this
+            # one its own copy so deleting or replacing either file can't break the other
+            storage = measurement.processed_image.storage
+            try:
+                with storage.open(result['processed_image_name'], 'rb') as processed_file:
+                    measurement.processed_image.save(
+                        f'processed_{uploaded_image.name}', File(processed_file), save=False
+                    )
+                measurement.save(update_fields=['processed_image', 'updated_at'])
+            except OSError as e:
+                logger.warning(f"Cached processed image {result['processed_image_name']} is unavailable: {e}")
         
-        # Save keypoints
-        for kp_data in result['keypoints']:
-            KeyPoint.objects.create(
+        # Save keypoints in a single INSERT
+        KeyPoint.objects.bulk_create([
+            KeyPoint(
                 measurement=measurement,
                 name=kp_data['name'],
                 x_coordinate=kp_data['x'],
                 y_coordinate=kp_data['y'],
                 confidence=kp_data.get('visibility', 0.0)
             )
+            for kp_data in result['keypoints']
+        ])
+        
+        if cached_result is None:
+            cache.set(result_cache_key, {
+                'success': True,
+                'measurements': result['measurements'],
+                'keypoints': result['keypoints'],
+                'confidence_score': result['confidence_score'],
+                'scale_factor': result.get('scale_factor', 1.0),
+                'processed_image_name': measurement.processed_image.name or None,
+            }, PROCESSING_RESULT_CACHE_TIMEOUT)
         
         # Serialize and return data
         measurement_serializer = MorphometricMeasurementSerializer(measurement)
@@ -247,9 +320,33 @@ def upload_and_process_image(request):
 @permission_classes([IsAuthenticated])
 def list_goats(request):
     """List all goats belonging to the authenticated user"""
-    goats = Goat.objects.filter(owner=request.user).order_by('-created_at')
-    serializer = GoatSerializer(goats, many=True)
-    return Response(serializer.data)
+    # Fast path: build GoatSerializer's output from values() rows instead of
+    # instantiating a model and running the full serializer per goat
+    fields = GoatSerializer().fields
+    owner = UserSerializer(request.user).data
+    rows = Goat.objects.filter(owner=request.user).annotate(
+        measurements_count=models.Count('measurements')
+    ).order_by('-created_at').values(
+        'id', 'name', 'breed', 'age_months', 'sex', 'weight_kg',
+        'created_at', 'updated_at', 'measurements_count'
+    )
+    
+    def represent(name, value):
+        return None if value is None else fields[name].to_representation(value)
+    
+    goats = [{
+        'id': str(row['id']),
+        'name': row['name'],
+        'breed': row['breed'],
+        'age_months': row['age_months'],
+        'sex': row['sex'],
+        'weight_kg': represent('weight_kg', row['weight_kg']),
+        'owner': owner,
+        'created_at': represent('created_at', row['created_at']),
+        'updated_at': represent('updated_at', row['updated_at']),
+        'measurements_count': row['measurements_count'],
+    } for row in rows]
+    return Response(goats)
 
 
 @api_view(['POST'])
@@ -268,12 +365,21 @@ def create_goat(request):
 def get_goat_measurements(request, goat_id):
     """Get all measurements for a specific goat"""
     try:
-        goat = Goat.objects.get(id=goat_id, owner=request.user)
-        measurements = MorphometricMeasurement.objects.filter(goat=goat).order_by('-measurement_date')
-        serializer = MorphometricMeasurementSerializer(measurements, many=True)
+        goat = Goat.objects.select_related('owner').annotate(
+            measurements_count=models.Count('measurements')
+        ).get(id=goat_id, owner=request.user)
+        # Going through the reverse manager hands every row this same goat instance
+        measurements = goat.measurements.select_related('measured_by').annotate(
+            keypoints_count=models.Count('keypoints')
+        )
+        paginator = MeasurementCursorPagination()
+        page = paginator.paginate_queryset(measurements, request)
+        serializer = MeasurementListSerializer(page, many=True)
         return Response({
             'goat': GoatSerializer(goat).data,
-            'measurements': serializer.data
+            'measurements': serializer.data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link()
         })
     except Goat.DoesNotExist:
         return Response({
@@ -281,20 +387,40 @@ def get_goat_measurements(request, goat_id):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
+def measurement_detail_etag(request, measurement_id):
+    """
+    ETag for the measurement detail payload, from the measurement's and its goat's
+    updated_at plus the goat's measurement count (all part of the response)
+    """
+    if not request.user.is_authenticated:
+        return None
+    version = MorphometricMeasurement.objects.filter(
+        id=measurement_id, goat__owner=request.user
+    ).annotate(
+        goat_measurements=models.Count('goat__measurements')
+    ).values_list('updated_at', 'goat__updated_at', 'goat_measurements').first()
+    if version is None:
+        return None
+    updated_at, goat_updated_at, goat_measurements = version
+    return f'{measurement_id}-{updated_at.timestamp()}-{goat_updated_at.timestamp()}-{goat_measurements}'
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=measurement_detail_etag)
 def get_measurement_detail(request, measurement_id):
     """Get detailed information about a specific measurement"""
     try:
-        measurement = MorphometricMeasurement.objects.get(
+        measurement = MorphometricMeasurement.objects.select_related(
+            'goat__owner', 'measured_by'
+        ).prefetch_related('keypoints').get(
             id=measurement_id, 
             goat__owner=request.user
         )
-        keypoints = KeyPoint.objects.filter(measurement=measurement)
         
         return Response({
             'measurement': MorphometricMeasurementSerializer(measurement).data,
-            'keypoints': KeyPointSerializer(keypoints, many=True).data,
+            'keypoints': KeyPointSerializer(measurement.keypoints.all(), many=True).data,
             'goat': GoatSerializer(measurement.goat).data
         })
     except MorphometricMeasurement.DoesNotExist:
@@ -322,16 +448,7 @@ def update_measurement(request, measurement_id):
         
         if serializer.is_valid():
             # If any measurements were manually updated, change method to HYBRID
-            manual_fields = [
-                'hauteur_au_garrot', 'hauteur_au_dos', 'hauteur_au_sternum',
-                'hauteur_au_sacrum', 'tour_de_poitrine', 'perimetre_thoracique',
-                'tour_abdominal', 'diametre_biscotal', 'largeur_poitrine',
-                'largeur_hanche', 'longueur_oreille', 'longueur_tete',
-                'largeur_tete', 'body_length', 'longueur_cou', 'tour_du_cou',
-                'longueur_queue'
-            ]
-            
-            for field in manual_fields:
+            for field in MEASUREMENT_FIELDS:
                 if field in request.data:
                     measurement.measurement_method = 'HYBRID'
                     break
@@ -351,18 +468,23 @@ def update_measurement(request, measurement_id):
 @permission_classes([IsAuthenticated])
 def measurement_statistics(request):
     """Get statistics about measurements for the user"""
-    measurements = MorphometricMeasurement.objects.filter(goat__owner=request.user)
+    # Single pass over the user's measurements instead of one query per count
+    totals = MorphometricMeasurement.objects.filter(goat__owner=request.user).aggregate(
+        total=models.Count('id'),
+        auto=models.Count('id', filter=models.Q(measurement_method='AUTO')),
+        manual=models.Count('id', filter=models.Q(measurement_method='MANUAL')),
+        hybrid=models.Count('id', filter=models.Q(measurement_method='HYBRID')),
+        avg_confidence=models.Avg('confidence_score'),
+    )
     
     stats = {
-        'total_measurements': measurements.count(),
+        'total_measurements': totals['total'],
         'total_goats': Goat.objects.filter(owner=request.user).count(),
-        'avg_confidence_score': measurements.aggregate(
-            avg_confidence=models.Avg('confidence_score')
-        )['avg_confidence'] or 0,
+        'avg_confidence_score': totals['avg_confidence'] or 0,
         'measurements_by_method': {
-            'AUTO': measurements.filter(measurement_method='AUTO').count(),
-            'MANUAL': measurements.filter(measurement_method='MANUAL').count(),
-            'HYBRID': measurements.filter(measurement_method='HYBRID').count(),
+            'AUTO': totals['auto'],
+            'MANUAL': totals['manual'],
+            'HYBRID': totals['hybrid'],
         }
     }
     
@@ -652,31 +774,25 @@ def analyze_measurement_trends(request):
                 'error': 'Goat not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Get measurement history
-        measurements = MorphometricMeasurement.objects.filter(goat=goat).order_by('measurement_date')
+        # Get measurement history: only the analysed columns, as plain tuples
+        # (no model instances), fetched once for both the length check and the frame
+        data = list(MorphometricMeasurement.objects.filter(goat=goat).order_by('measurement_date').values_list(
+            'measurement_date', 'hauteur_au_garrot', 'hauteur_au_dos', 'body_length',
+            'tour_de_poitrine', 'largeur_poitrine', 'confidence_score'
+        ))
         
-        if measurements.count() < 2:
+        if len(data) < 2:
             return Response({
                 'success': False,
                 'error': 'Insufficient measurement history for analysis'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Convert to DataFrame for analysis
-        data = []
-        for m in measurements:
-            row = {
-                'date': m.measurement_date,
-                'hauteur_au_garrot': m.hauteur_au_garrot,
-                'hauteur_au_dos': m.hauteur_au_dos,
-                'body_length': m.body_length,
-                'tour_de_poitrine': m.tour_de_poitrine,
-                'largeur_poitrine': m.largeur_poitrine,
-                'confidence_score': m.confidence_score,
-                'age_days': (m.measurement_date - goat.birth_date).days if goat.birth_date else None
-            }
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = pd.DataFrame.from_records(data, columns=[
+            'date', 'hauteur_au_garrot', 'hauteur_au_dos', 'body_length',
+            'tour_de_poitrine', 'largeur_poitrine', 'confidence_score'
+        ])
+        df['age_days'] = (df['date'] - goat.birth_date).dt.days if goat.birth_date else None
         
         analysis_result = {}
         
@@ -1143,32 +1259,10 @@ def train_user_specific_model(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Prepare training data
-        data = []
-        for measurement in user_measurements:
-            row = {
-                'goat_id': measurement.goat.id,
-                'breed': measurement.goat.breed,
-                'sex': measurement.goat.sex,
-                'confidence_score': measurement.confidence_score,
-                'hauteur_au_garrot': measurement.hauteur_au_garrot,
-                'hauteur_au_dos': measurement.hauteur_au_dos,
-                'hauteur_au_sternum': measurement.hauteur_au_sternum,
-                'hauteur_au_sacrum': measurement.hauteur_au_sacrum,
-                'body_length': measurement.body_length,
-                'tour_de_poitrine': measurement.tour_de_poitrine,
-                'perimetre_thoracique': measurement.perimetre_thoracique,
-                'largeur_poitrine': measurement.largeur_poitrine,
-                'largeur_hanche': measurement.largeur_hanche,
-                'largeur_tete': measurement.largeur_tete,
-                'longueur_tete': measurement.longueur_tete,
-                'longueur_oreille': measurement.longueur_oreille,
-                'longueur_cou': measurement.longueur_cou,
-                'tour_du_cou': measurement.tour_du_cou,
-                'longueur_queue': measurement.longueur_queue,
-            }
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = pd.DataFrame.from_records(
+            [get_training_row(m) for m in user_measurements.select_related('goat')],
+            columns=TRAINING_COLUMNS
+        )
         
         # Initialize trainer
         trainer = AdvancedMLTrainer()
@@ -1297,23 +1391,26 @@ def batch_upload_view(request):
                 status='PENDING'
             )
             
-            # Save uploaded images
+            # Save uploaded images (files are stored by pre_save; rows go in one INSERT)
             images = form.cleaned_data['images']
-            for index, image in enumerate(images):
-                BatchImageUpload.objects.create(
+            BatchImageUpload.objects.bulk_create([
+                BatchImageUpload(
                     session=session,
                     original_filename=image.name,
                     image_file=image,
                     order_index=index,
                     status='PENDING'
                 )
+                for index, image in enumerate(images)
+            ])
             
             # Start processing (you can make this asynchronous with Celery if needed)
             try:
                 process_batch_images.delay(session.id, form.cleaned_data)
             except:
-                # Fallback to synchronous processing if Celery is not available
-                process_batch_images_sync(session.id, form.cleaned_data)
+                # Fallback to synchronous processing if Celery is not available; the
+                # session was just created here, so hand it over instead of re-reading it
+                process_batch_images_sync(session.id, form.cleaned_data, session=session)
             
             messages.success(request, f'Successfully uploaded {len(images)} images for processing!')
             return redirect('measurements:batch_status', session_id=session.id)
@@ -1382,15 +1479,58 @@ def batch_status_api(request, session_id):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
-def process_batch_images_sync(session_id, form_data):
-    """Process batch images synchronously"""
+def prefetch_batch_images(batch_images, load):
+    """
+    Yield (batch_image, future) pairs, where the future runs load(batch_image) on a
+    worker thread. The next image is loaded while the caller processes the current
+    one: file reads and OpenCV decoding release the GIL, so the two overlap. Pose
+    detection itself stays on the caller's thread, whose MediaPipe graphs are not
+    thread-safe
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        for batch_image in batch_images:
+            future = executor.submit(load, batch_image)
+            if pending is not None:
+                yield pending
+            pending = (batch_image, future)
+        if pending is not None:
+            yield pending
+
+
+def read_batch_image(batch_image):
+    """Read a batch image's stored bytes"""
+    with batch_image.image_file.open('rb') as image_file:
+        return image_file.read()
+
+
+def decode_batch_image(batch_image):
+    """Read and decode a batch image to BGR"""
+    image = cv2.imdecode(np.frombuffer(read_batch_image(batch_image), dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError('Could not decode image')
+    return image
+
+
+def process_batch_images_sync(session_id, form_data, session=None):
+    """
+    Process batch images synchronously. Callers that already hold the session
+    (with its goat and user loaded) can pass it to skip re-reading it.
+    Only a PENDING session is processed, so duplicate runs for the same
+    session (e.g. a redelivered task) return without doing any work
+    """
     import time
     from django.utils import timezone
     
     try:
-        session = MeasurementSession.objects.get(id=session_id)
+        # Claim the session with one conditional UPDATE; it matches for a single caller only
+        if not MeasurementSession.objects.filter(id=session_id, status='PENDING').update(status='PROCESSING'):
+            logger.info(f"Batch session {session_id} is not pending; skipping duplicate processing")
+            return
+        
+        if session is None:
+            session = MeasurementSession.objects.select_related('goat', 'user').get(id=session_id)
         session.status = 'PROCESSING'
-        session.save()
         
         batch_images = BatchImageUpload.objects.filter(session=session).order_by('order_index')
         use_advanced_ai = form_data.get('use_advanced_ai', True)
@@ -1399,72 +1539,83 @@ def process_batch_images_sync(session_id, form_data):
         processed_count = 0
         failed_count = 0
         
-        for batch_image in batch_images:
+        # One processor for the whole batch (and reused by later batches on this thread)
+        if use_advanced_ai:
+            processor = get_advanced_processor()
+        else:
+            processor = get_processor()
+        
+        # The advanced processor decodes the bytes itself
+        load = read_batch_image if use_advanced_ai else decode_batch_image
+        
+        for batch_image, loaded in prefetch_batch_images(batch_images, load):
             start_time = time.time()
             batch_image.status = 'PROCESSING'
-            batch_image.save()
+            batch_image.save(update_fields=['status'])
             
             try:
-                # Read image data
-                batch_image.image_file.open()
-                image_data = batch_image.image_file.read()
-                
                 if use_advanced_ai:
-                    processor = AdvancedGoatMorphometryProcessor()
                     result = processor.process_goat_image_advanced(
-                        image_data=image_data,
+                        image_data=loaded.result(),
                         reference_length=reference_length,
                         breed=session.goat.breed
                     )
                 else:
-                    processor = GoatMorphometryProcessor()
-                    # Convert to PIL Image for basic processor
-                    from PIL import Image
-                    import io
-                    pil_image = Image.open(io.BytesIO(image_data))
-                    result = processor.process_goat_image(
-                        pil_image,
-                        reference_length=reference_length
+                    # Decoded straight from the stored bytes; no temp file or PIL round trip
+                    image = loaded.result()
+                    # The batch only stores measurements, not an annotated image
+                    result = processor.process_image(
+                        image,
+                        reference_length_cm=reference_length,
+                        annotate=False
                     )
+                    if not result.get('success'):
+                        raise ValueError(result.get('error', 'Image processing failed'))
                 
-                # Create measurement record
-                measurement = MorphometricMeasurement.objects.create(
-                    goat=session.goat,
-                    original_image=batch_image.image_file,
-                    measured_by=session.user,
-                    measurement_method='AUTO' if use_advanced_ai else 'MANUAL',
-                    confidence_score=result.get('confidence_score'),
-                    reference_object_length_cm=reference_length,
-                    **{k: v for k, v in result.get('measurements', {}).items() if v is not None}
-                )
-                
-                # Save keypoints if available
-                if 'keypoints' in result:
-                    for kp_name, kp_data in result['keypoints'].items():
-                        KeyPoint.objects.create(
+                # Measurement and keypoints are written together, so a failure
+                # part-way leaves no orphan measurement behind
+                with transaction.atomic():
+                    measurement = MorphometricMeasurement.objects.create(
+                        goat=session.goat,
+                        original_image=batch_image.image_file,
+                        measured_by=session.user,
+                        measurement_method='AUTO' if use_advanced_ai else 'MANUAL',
+                        confidence_score=result.get('confidence_score'),
+                        reference_object_length_cm=reference_length,
+                        **{k: v for k, v in result.get('measurements', {}).items() if v is not None}
+                    )
+                    
+                    # Keypoints come back as a list of dicts, as in the upload view
+                    KeyPoint.objects.bulk_create([
+                        KeyPoint(
                             measurement=measurement,
-                            name=kp_name,
-                            x_coordinate=kp_data['x'],
-                            y_coordinate=kp_data['y'],
-                            confidence=kp_data.get('confidence')
+                            name=kp['name'],
+                            x_coordinate=kp['x'],
+                            y_coordinate=kp['y'],
+                            confidence=kp.get('visibility')
                         )
+                        for kp in result.get('keypoints', [])
+                    ])
                 
-                # Update batch image
-                batch_image.measurement = measurement
-                batch_image.status = 'COMPLETED'
-                batch_image.processed_at = timezone.now()
-                batch_image.processing_time_seconds = time.time() - start_time
-                batch_image.save()
+                # Record the result in one UPDATE of just these columns
+                BatchImageUpload.objects.filter(pk=batch_image.pk).update(
+                    measurement=measurement,
+                    status='COMPLETED',
+                    processed_at=timezone.now(),
+                    processing_time_seconds=time.time() - start_time
+                )
                 
                 processed_count += 1
                 
             except Exception as e:
-                logger.error(f"Failed to process batch image {batch_image.id}: {e}")
-                batch_image.status = 'FAILED'
-                batch_image.error_message = str(e)
-                batch_image.processed_at = timezone.now()
-                batch_image.processing_time_seconds = time.time() - start_time
-                batch_image.save()
+                logger.exception(f"Failed to process batch image {batch_image.id}: {e}")
+                # Same single UPDATE as the success path; keep pathological messages bounded
+                BatchImageUpload.objects.filter(pk=batch_image.pk).update(
+                    status='FAILED',
+                    error_message=str(e)[:BATCH_ERROR_MESSAGE_MAX_LENGTH],
+                    processed_at=timezone.now(),
+                    processing_time_seconds=time.time() - start_time
+                )
                 
                 failed_count += 1
         
@@ -1480,17 +1631,17 @@ def process_batch_images_sync(session_id, form_data):
         else:
             session.status = 'PARTIAL'
         
-        session.save()
+        session.save(update_fields=['processed_images', 'failed_images', 'completed_at', 'status'])
         
         logger.info(f"Batch processing completed for session {session_id}: {processed_count} successful, {failed_count} failed")
         
     except Exception as e:
         logger.error(f"Batch processing failed for session {session_id}: {e}")
         try:
-            session = MeasurementSession.objects.get(id=session_id)
-            session.status = 'FAILED'
-            session.completed_at = timezone.now()
-            session.save()
+            MeasurementSession.objects.filter(id=session_id).update(
+                status='FAILED',
+                completed_at=timezone.now()
+            )
         except:
             pass
 
@@ -1543,7 +1694,7 @@ def retry_failed_images(request, session_id):
         # Update session status
         session.status = 'PENDING'
         session.failed_images = 0
-        session.save()
+        session.save(update_fields=['status', 'failed_images'])
         
         # Restart processing
         form_data = {